@@ -1,108 +1,488 @@
 #!/usr/bin/env python3
 
-from http.server import HTTPServer, BaseHTTPRequestHandler
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
 import json
+import logging
 import requests
-import base64
+from requests.adapters import HTTPAdapter
+import binascii
+import re
 import urllib.parse
 import sys
+import sqlite3
+import threading
+import time
+from array import array
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+log = logging.getLogger(__name__)
+
+# orjson decodes the base64+JSON tx firehose several times faster; stdlib json is the fallback
+try:
+    import orjson
+    json_loads = orjson.loads
+except ImportError:
+    json_loads = json.loads
+
+# simdjson parses block batches with SIMD and only materializes the fields we touch
+try:
+    import simdjson
+except ImportError:
+    simdjson = None
+
+# Without simdjson, ijson lets fetch_blocks stream just the tx arrays out of large block responses
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+SCAN_WORKERS = 32  # Concurrent block batches in flight; sized to the connection pool
+
+# Shared keep-alive session so the block scan reuses pooled TCP connections to Tendermint
+SESSION = requests.Session()
+SESSION.mount('http://', HTTPAdapter(pool_connections=16, pool_maxsize=SCAN_WORKERS))
+SESSION.headers['Connection'] = 'keep-alive'
+SESSION.headers['Accept-Encoding'] = 'gzip'
+
+TENDERMINT_RPC = 'http://localhost:26657'
+BLOCK_BATCH_SIZE = 20  # Tendermint-style cap on JSON-RPC batch length
+TXS_PREFIX = 'item.result.block.data.txs'  # ijson path to each block's txs in a batch response
+CACHE_PATH = 'balance_cache.db'
+# Addresses are restricted to alphanumerics so they can be interpolated into the JSON template unescaped
+ADDRESS_RE = re.compile(r'[A-Za-z0-9]+')
+BALANCE_PATH_RE = re.compile(r'^/api/v1/address/([A-Za-z0-9]+)/balance/?$')
+BALANCES_PATH_RE = re.compile(r'^/api/v1/addresses/balance/?(?:\?(.*))?$')
+# Fixed response schema - only the address and balance figures vary per request
+BALANCE_RESPONSE_TEMPLATE = (
+    b'{"address":"%s",'
+    b'"balance":%.8f,"balance_satoshis":%d,'
+    b'"confirmed":%.8f,"confirmed_satoshis":%d,'
+    b'"unconfirmed":0.0,"unconfirmed_satoshis":0,'
+    b'"total_received":%.8f,"total_received_satoshis":%d,'
+    b'"total_sent":0.0,"total_sent_satoshis":0,'
+    b'"transaction_count":%d,"last_activity":""}'
+)
+# Nodes serialize SignedTransaction compactly with "algorithm" after "transaction", so the
+# marker can't be matched as a base64 prefix but is a reliable substring of the decoded bytes
+COINBASE_MARKER = b'"algorithm":"coinbase"'
+COINBASE_CACHE_SIZE = 100000  # Decoded blocks kept in memory, shared by all addresses
+EMPTY_SUMMARY = ((), (), ())  # Shared by every block without a coinbase tx
+DELTA_INDEX_INTERVAL = 5  # Seconds between background passes over new blocks
+KEEPALIVE_INTERVAL = 20  # Seconds between pings, inside Tendermint's idle connection timeout
+
+# Finalized blocks are immutable, so decoded coinbase summaries stay valid once cached
+_coinbase_cache = OrderedDict()
+_coinbase_lock = threading.Lock()
+
+# Shared by all request threads so concurrent balance queries can't oversubscribe the pool
+_scan_pool = ThreadPoolExecutor(max_workers=SCAN_WORKERS)
+_cache_lock = threading.Lock()
+_parser_local = threading.local()
+
+def fetch_blocks(heights):
+    """Fetch several blocks in one JSON-RPC batch request, returning {height: txs}"""
+    batch = [
+        {"jsonrpc": "2.0", "id": height, "method": "block", "params": {"height": str(height)}}
+        for height in heights
+    ]
+    
+    if simdjson is not None:
+        resp = SESSION.post(f'{TENDERMINT_RPC}/', json=batch, timeout=5)
+        return collect_block_txs(simdjson_parser().parse(resp.content))
+    
+    if ijson is not None:
+        resp = SESSION.post(f'{TENDERMINT_RPC}/', json=batch, timeout=5, stream=True)
+        resp.raw.decode_content = True  # let urllib3 undo the gzip transfer encoding
+        try:
+            return stream_block_txs(resp.raw)
+        finally:
+            resp.close()
+    
+    resp = SESSION.post(f'{TENDERMINT_RPC}/', json=batch, timeout=5)
+    return collect_block_txs(json_loads(resp.content))
+
+def collect_block_txs(items):
+    """Map each parsed batch response item to its block's txs, keyed by id"""
+    blocks = {}
+    for item in items:
+        # Responses may arrive in any order and fail individually
+        try:
+            txs = item['result']['block']['data']['txs']
+            blocks[int(item['id'])] = list(txs) if txs else []
+        except (KeyError, TypeError):
+            log.debug("Error processing block %s: %s", item.get('id'), item.get('error'))
+    return blocks
+
+def simdjson_parser():
+    """Per-thread simdjson parser - a Parser and its documents can't be shared across threads"""
+    parser = getattr(_parser_local, 'parser', None)
+    if parser is None:
+        parser = _parser_local.parser = simdjson.Parser()
+    return parser
+
+def stream_block_txs(stream):
+    """Incrementally pull only the tx arrays out of a batch response, keyed by id.
+    
+    Headers, commits and evidence are tokenized but never built into Python objects.
+    """
+    blocks = {}
+    height = None
+    txs = None
+    for prefix, event, value in ijson.parse(stream):
+        if prefix == TXS_PREFIX + '.item':
+            txs.append(value)
+        elif prefix == TXS_PREFIX:
+            if event in ('start_array', 'null'):
+                txs = []
+        elif prefix == 'item.id':
+            height = int(value)
+        elif prefix == 'item' and event == 'end_map':
+            # Responses may arrive in any order and fail individually
+            if txs is None:
+                log.debug("Error processing block %s: no result in batch response", height)
+            else:
+                blocks[height] = txs
+            height = None
+            txs = None
+    return blocks
+
+def summarize_block(txs):
+    """Extract the coinbase txs of a block as a struct of arrays.
+    
+    Returns (signers, out_addrs, out_vals) where entry i holds the signer_key of the
+    i-th coinbase tx, a tuple of its output addresses and an array('q') of their values.
+    """
+    # Hot loop of the chain scan: bind the C-level decoders to locals and call
+    # binascii directly rather than through base64.b64decode's Python wrapper
+    b64decode = binascii.a2b_base64
+    loads = json_loads
+    marker = COINBASE_MARKER
+    intern = sys.intern
+    
+    signers = []
+    out_addrs = []
+    out_vals = []
+    for tx_b64 in txs:
+        # Skip the JSON parse for transfers - only coinbase txs carry the marker
+        tx_bytes = b64decode(tx_b64)
+        if marker not in tx_bytes:
+            continue
+        
+        # Decode signed transaction
+        signed_tx = loads(tx_bytes)
+        if signed_tx.get('algorithm') != 'coinbase':
+            continue
+        
+        # Decode inner transaction
+        outputs = loads(b64decode(signed_tx['transaction'])).get('outputs', [])
+        # Interned so the same miner address is stored once across all cached blocks
+        signers.append(intern(signed_tx.get('signer_key') or ''))
+        out_addrs.append(tuple([intern(output.get('address') or '') for output in outputs]))
+        out_vals.append(array('q', [output.get('value', 0) for output in outputs]))
+    
+    if not signers:
+        return EMPTY_SUMMARY
+    return tuple(signers), tuple(out_addrs), tuple(out_vals)
+
+def coinbase_summaries(heights):
+    """Return {height: coinbase summary} for a batch, only fetching blocks not already cached"""
+    with _coinbase_lock:
+        summaries = {height: _coinbase_cache[height] for height in heights if height in _coinbase_cache}
+        for height in summaries:
+            _coinbase_cache.move_to_end(height)
+    
+    missing = [height for height in heights if height not in summaries]
+    if not missing:
+        return summaries
+    
+    blocks = fetch_blocks(missing)
+    for height in missing:
+        if height not in blocks:
+            continue
+        try:
+            summary = summarize_block(blocks[height])
+        except Exception as e:
+            log.debug("Error processing block %s: %s", height, e)
+            continue
+        
+        summaries[height] = summary
+        with _coinbase_lock:
+            _coinbase_cache[height] = summary
+            if len(_coinbase_cache) > COINBASE_CACHE_SIZE:
+                _coinbase_cache.popitem(last=False)
+    return summaries
+
+def scan_blocks(heights, scanned_heights):
+    """Sum coinbase rewards within one batch of heights for every address in scanned_heights.
+    
+    scanned_heights maps each address to the height it is already checkpointed at;
+    blocks at or below that height are not counted again for that address.
+    Returns ({address: [balance, mining_rewards]}, complete) where complete is False
+    if any block in the batch could not be fetched or decoded.
+    """
+    totals = {address: [0, 0] for address in scanned_heights}
+    
+    try:
+        summaries = coinbase_summaries(heights)
+    except Exception as e:
+        log.debug("Error fetching blocks %s-%s: %s", heights[0], heights[-1], e)
+        return totals, False
+    
+    complete = True
+    for height in heights:
+        if height not in summaries:
+            complete = False
+            continue
+        
+        # Sum outputs of coinbase txs that pay their own signer
+        for signer_key, addrs, vals in zip(*summaries[height]):
+            if height <= scanned_heights.get(signer_key, height):
+                continue
+            for output_address, value in zip(addrs, vals):
+                if output_address == signer_key:
+                    total = totals[signer_key]
+                    total[0] += value
+                    total[1] += 1
+    
+    return totals, complete
+
+def open_cache(path=CACHE_PATH):
+    """Open the on-disk balance cache, creating the tables on first use"""
+    conn = sqlite3.connect(path, check_same_thread=False)
+    conn.execute(
+        'CREATE TABLE IF NOT EXISTS balances '
+        '(address TEXT PRIMARY KEY, height INTEGER, balance INTEGER, rewards INTEGER)'
+    )
+    # Per-block reward deltas, so a balance is one indexed prefix sum instead of a chain scan
+    conn.execute(
+        'CREATE TABLE IF NOT EXISTS deltas '
+        '(address TEXT, height INTEGER, delta INTEGER, rewards INTEGER, PRIMARY KEY (address, height))'
+    )
+    conn.execute('CREATE TABLE IF NOT EXISTS delta_progress (id INTEGER PRIMARY KEY CHECK (id = 0), height INTEGER)')
+    conn.execute('INSERT OR IGNORE INTO delta_progress (id, height) VALUES (0, 0)')
+    conn.commit()
+    return conn
+
+def get_latest_height():
+    """Get the latest block height from Tendermint"""
+    resp = SESSION.get(f'{TENDERMINT_RPC}/status', timeout=5)
+    data = json_loads(resp.content)
+    return int(data['result']['sync_info']['latest_block_height'])
+
+def get_indexed_height(conn):
+    """Height up to which the deltas table is complete"""
+    with _cache_lock:
+        return conn.execute('SELECT height FROM delta_progress WHERE id = 0').fetchone()[0]
+
+def index_new_blocks(conn):
+    """Append reward deltas for every block past the indexed height, in height order"""
+    indexed_height = get_indexed_height(conn)
+    latest_height = get_latest_height()
+    window = BLOCK_BATCH_SIZE * SCAN_WORKERS
+    
+    for window_start in range(indexed_height + 1, latest_height + 1, window):
+        window_end = min(window_start + window, latest_height + 1)
+        batches = [
+            range(start, min(start + BLOCK_BATCH_SIZE, window_end))
+            for start in range(window_start, window_end, BLOCK_BATCH_SIZE)
+        ]
+        # Fetch directly rather than through coinbase_summaries so a full-chain
+        # walk doesn't evict the blocks live queries are hitting
+        blocks = {}
+        for fetched in _scan_pool.map(fetch_blocks, batches):
+            blocks.update(fetched)
+        
+        rows = []
+        for height in range(window_start, window_end):
+            # Progress must stay contiguous - stop at the first fetch gap and retry it next pass
+            if height not in blocks:
+                break
+            try:
+                summary = summarize_block(blocks[height])
+            except Exception as e:
+                # Refetching won't make an undecodable block decode - skip it with no
+                # deltas, as the full scan does, so progress keeps advancing
+                log.debug("Error processing block %s: %s", height, e)
+                indexed_height = height
+                continue
+            
+            deltas = {}
+            for signer_key, addrs, vals in zip(*summary):
+                for output_address, value in zip(addrs, vals):
+                    if output_address == signer_key:
+                        delta = deltas.setdefault(signer_key, [0, 0])
+                        delta[0] += value
+                        delta[1] += 1
+            rows.extend((address, height, delta, rewards) for address, (delta, rewards) in deltas.items())
+            indexed_height = height
+        
+        with _cache_lock:
+            conn.executemany(
+                'INSERT OR REPLACE INTO deltas (address, height, delta, rewards) VALUES (?, ?, ?, ?)', rows
+            )
+            conn.execute('UPDATE delta_progress SET height = ? WHERE id = 0', (indexed_height,))
+            conn.commit()
+        
+        if indexed_height < window_end - 1:
+            return
+
+def run_delta_indexer(conn, interval=DELTA_INDEX_INTERVAL):
+    """Background worker keeping the deltas table caught up with the chain"""
+    while True:
+        try:
+            index_new_blocks(conn)
+        except Exception as e:
+            log.warning("Error indexing blocks: %s", e)
+        time.sleep(interval)
+
+def keep_connection_warm(interval=KEEPALIVE_INTERVAL):
+    """Ping Tendermint so a pooled connection is already open before (and between) balance queries"""
+    try:
+        SESSION.get(f'{TENDERMINT_RPC}/status', timeout=5)
+    except requests.exceptions.RequestException as e:
+        log.warning("Tendermint keep-alive ping failed: %s", e)
+    
+    timer = threading.Timer(interval, keep_connection_warm, args=(interval,))
+    timer.daemon = True
+    timer.start()
+
+def render_balance(address, balance_info):
+    """Render one address's balance_info into the fixed balance JSON object"""
+    sats = balance_info["balance"]
+    shadow = sats * 1e-8  # Convert to SHADOW once, reused for every amount field
+    return BALANCE_RESPONSE_TEMPLATE % (
+        address.encode(),
+        shadow, sats,
+        shadow, sats,
+        shadow, sats,
+        balance_info["mining_rewards"],
+    )
 
 class BalanceHandler(BaseHTTPRequestHandler):
+    cache = None  # sqlite3 connection set up in __main__
+    
     def do_GET(self):
-        # Parse the path to extract address
-        print(f"Received request: {self.path}")
-        parts = self.path.split('/')
-        print(f"Parts: {parts}")
+        # Parse the path to extract address(es)
+        match = BALANCE_PATH_RE.match(self.path)
+        if match:
+            self.handle_balance_request(match.group(1))
+            return
         
-        if self.path.startswith('/api/v1/address/'):
-            if len(parts) >= 5 and parts[4] == 'balance':
-                address = parts[3]
-                print(f"Extracted address: {address}")
-                self.handle_balance_request(address)
-            else:
-                print(f"Invalid path structure, parts length: {len(parts)}")
-                self.send_404()
+        match = BALANCES_PATH_RE.match(self.path)
+        if match:
+            query = urllib.parse.parse_qs(match.group(1) or '')
+            addresses = frozenset(
+                address.strip()
+                for param in query.get('addrs', [])
+                for address in param.split(',')
+                if address.strip()
+            )
+            self.handle_balances_request(addresses)
         else:
-            print("Path doesn't start with /api/v1/address/")
             self.send_404()
     
     def handle_balance_request(self, address):
         try:
             balance_info = self.calculate_balance(address)
-            
-            # Send response
-            self.send_response(200)
-            self.send_header('Content-Type', 'application/json')
-            self.send_header('Access-Control-Allow-Origin', '*')
-            self.end_headers()
-            
-            response = {
-                "address": address,
-                "balance": balance_info["balance"] / 100000000.0,  # Convert to SHADOW
-                "balance_satoshis": balance_info["balance"],
-                "confirmed": balance_info["balance"] / 100000000.0,
-                "confirmed_satoshis": balance_info["balance"], 
-                "unconfirmed": 0.0,
-                "unconfirmed_satoshis": 0,
-                "total_received": balance_info["balance"] / 100000000.0,
-                "total_received_satoshis": balance_info["balance"],
-                "total_sent": 0.0,
-                "total_sent_satoshis": 0,
-                "transaction_count": balance_info["mining_rewards"],
-                "last_activity": ""
-            }
-            
-            self.wfile.write(json.dumps(response).encode())
+            self.send_json(render_balance(address, balance_info))
             
         except Exception as e:
-            print(f"Error calculating balance: {e}")
+            log.warning("Error calculating balance: %s", e)
             self.send_error(500, f"Error calculating balance: {str(e)}")
     
+    def handle_balances_request(self, addresses):
+        if not addresses or not all(ADDRESS_RE.fullmatch(address) for address in addresses):
+            self.send_error(400, "Expected ?addrs=<address>,<address>,...")
+            return
+        
+        try:
+            balances = self.calculate_balances(addresses)
+            body = b'{' + b','.join(
+                b'"%s":%s' % (address.encode(), render_balance(address, balance_info))
+                for address, balance_info in balances.items()
+            ) + b'}'
+            self.send_json(body)
+            
+        except Exception as e:
+            log.warning("Error calculating balances: %s", e)
+            self.send_error(500, f"Error calculating balances: {str(e)}")
+    
+    def log_message(self, format, *args):
+        # Silence the per-request access log written to stderr by BaseHTTPRequestHandler
+        pass
+    
+    def send_json(self, body):
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('Access-Control-Allow-Origin', '*')
+        self.end_headers()
+        self.wfile.write(body)
+    
     def calculate_balance(self, address):
         """Calculate balance by scanning Tendermint blocks"""
+        return self.calculate_balances(frozenset([address]))[address]
+    
+    def calculate_balances(self, addresses):
+        """Calculate balances for several addresses in a single sweep over Tendermint blocks"""
         try:
             # Get latest height
-            resp = requests.get('http://localhost:26657/status')
-            data = resp.json()
-            latest_height = int(data['result']['sync_info']['latest_block_height'])
+            latest_height = get_latest_height()
             
-            balance = 0
-            mining_rewards = 0
+            # Resume each address from its last cached height - finalized blocks never change
+            scanned_heights = {address: 0 for address in addresses}
+            balances = {address: {"balance": 0, "mining_rewards": 0} for address in addresses}
+            if self.cache is not None:
+                placeholders = ','.join('?' * len(addresses))
+                with _cache_lock:
+                    rows = self.cache.execute(
+                        f'SELECT address, height, balance, rewards FROM balances WHERE address IN ({placeholders})',
+                        tuple(addresses)
+                    ).fetchall()
+                for address, height, balance, mining_rewards in rows:
+                    scanned_heights[address] = height
+                    balances[address] = {"balance": balance, "mining_rewards": mining_rewards}
+                
+                # Where the background indexer is further ahead, take its prefix sum instead
+                indexed_height = get_indexed_height(self.cache)
+                with _cache_lock:
+                    for address in addresses:
+                        if indexed_height <= scanned_heights[address]:
+                            continue
+                        balance, mining_rewards = self.cache.execute(
+                            'SELECT COALESCE(SUM(delta), 0), COALESCE(SUM(rewards), 0) FROM deltas '
+                            'WHERE address = ? AND height <= ?',
+                            (address, indexed_height)
+                        ).fetchone()
+                        scanned_heights[address] = indexed_height
+                        balances[address] = {"balance": balance, "mining_rewards": mining_rewards}
             
-            # Scan all blocks (optimize later if needed)
-            for height in range(1, latest_height + 1):
-                try:
-                    resp = requests.get(f'http://localhost:26657/block?height={height}')
-                    block_data = resp.json()
-                    txs = block_data['result']['block']['data']['txs']
-                    
-                    for tx_b64 in txs:
-                        # Decode signed transaction
-                        tx_bytes = base64.b64decode(tx_b64)
-                        signed_tx = json.loads(tx_bytes)
-                        
-                        # Check if coinbase to our address
-                        if (signed_tx.get('algorithm') == 'coinbase' and 
-                            signed_tx.get('signer_key') == address):
-                            
-                            # Decode inner transaction
-                            inner_bytes = base64.b64decode(signed_tx['transaction'])
-                            inner_tx = json.loads(inner_bytes)
-                            
-                            # Sum outputs
-                            for output in inner_tx.get('outputs', []):
-                                if output.get('address') == address:
-                                    balance += output.get('value', 0)
-                                    mining_rewards += 1
-                                    
-                except Exception as e:
-                    print(f"Error processing block {height}: {e}")
-                    continue
+            # Scan new blocks, BLOCK_BATCH_SIZE heights per request, SCAN_WORKERS requests in flight
+            batches = [
+                range(start, min(start + BLOCK_BATCH_SIZE, latest_height + 1))
+                for start in range(min(scanned_heights.values()) + 1, latest_height + 1, BLOCK_BATCH_SIZE)
+            ]
+            results = list(_scan_pool.map(lambda heights: scan_blocks(heights, scanned_heights), batches))
+            
+            for totals, _ in results:
+                for address, (balance, mining_rewards) in totals.items():
+                    balances[address]["balance"] += balance
+                    balances[address]["mining_rewards"] += mining_rewards
+            
+            # Only checkpoint a fully scanned range, otherwise failed blocks would be skipped forever
+            if self.cache is not None and all(complete for _, complete in results):
+                with _cache_lock:
+                    self.cache.executemany(
+                        'INSERT OR REPLACE INTO balances (address, height, balance, rewards) VALUES (?, ?, ?, ?)',
+                        [
+                            (address, latest_height, info["balance"], info["mining_rewards"])
+                            for address, info in balances.items()
+                        ]
+                    )
+                    self.cache.commit()
                     
-            return {
-                "balance": balance,
-                "mining_rewards": mining_rewards
-            }
+            return balances
             
         except Exception as e:
             raise Exception(f"Failed to calculate balance: {str(e)}")
@@ -115,7 +495,12 @@ class BalanceHandler(BaseHTTPRequestHandler):
 
 if __name__ == '__main__':
     port = 8082  # Different port to avoid conflicts
-    server = HTTPServer(('localhost', port), BalanceHandler)
+    logging.basicConfig(level=logging.WARNING)
+    BalanceHandler.cache = open_cache()
+    keep_connection_warm()
+    threading.Thread(target=run_delta_indexer, args=(BalanceHandler.cache,), daemon=True).start()
+    server = ThreadingHTTPServer(('localhost', port), BalanceHandler)
     print(f"🌐 Balance API server starting on http://localhost:{port}")
     print(f"📊 Example: http://localhost:{port}/api/v1/address/S427a724d41e3a5a03d1f83553134239813272bc2c4b2d50737/balance")
+    print(f"📊 Batch: http://localhost:{port}/api/v1/addresses/balance?addrs=<address>,<address>")
     server.serve_forever()
\ No newline at end of file
@@ -1,29 +1,51 @@
 #!/usr/bin/env python3
 
 import requests
+from requests.adapters import HTTPAdapter
 import base64
 import json
 
+# Share balance_api's coinbase pre-filter so both scanners skip the same txs
+from balance_api import COINBASE_MARKER
+
+# orjson decodes the base64+JSON tx firehose several times faster; stdlib json is the fallback
+try:
+    import orjson
+    json_loads = orjson.loads
+except ImportError:
+    json_loads = json.loads
+
+# Shared keep-alive session so the block scan reuses one TCP connection to Tendermint
+SESSION = requests.Session()
+SESSION.mount('http://', HTTPAdapter(pool_connections=16, pool_maxsize=64))
+SESSION.headers['Connection'] = 'keep-alive'
+SESSION.headers['Accept-Encoding'] = 'gzip'
+
 def get_latest_height():
     """Get the latest block height from Tendermint"""
-    resp = requests.get('http://localhost:26657/status')
-    data = resp.json()
+    resp = SESSION.get('http://localhost:26657/status', timeout=5)
+    data = json_loads(resp.content)
     return int(data['result']['sync_info']['latest_block_height'])
 
 def get_block(height):
     """Get a block from Tendermint"""
-    resp = requests.get(f'http://localhost:26657/block?height={height}')
-    return resp.json()
+    resp = SESSION.get(f'http://localhost:26657/block?height={height}', timeout=5)
+    return json_loads(resp.content)
 
-def decode_transaction(tx_b64):
-    """Decode a base64-encoded transaction"""
+def extract_coinbase_outputs(tx_b64, address, address_bytes):
+    """Decode a tx and return its outputs if it is a coinbase signed by address, else None"""
     tx_bytes = base64.b64decode(tx_b64)
-    return json.loads(tx_bytes)
-
-def decode_inner_transaction(inner_tx_b64):
-    """Decode the inner transaction from coinbase"""
-    inner_bytes = base64.b64decode(inner_tx_b64)
-    return json.loads(inner_bytes)
+    # Two cheap byte scans rule out almost every tx before any JSON is parsed;
+    # a matching signer_key must appear literally in the JSON body
+    if COINBASE_MARKER not in tx_bytes or address_bytes not in tx_bytes:
+        return None
+    
+    signed_tx = json_loads(tx_bytes)
+    if signed_tx.get('algorithm') != 'coinbase' or signed_tx.get('signer_key') != address:
+        return None
+    
+    # Decode the inner transaction
+    return json_loads(base64.b64decode(signed_tx['transaction'])).get('outputs', [])
 
 def calculate_balance(address):
     """Calculate balance for an address by scanning all blocks"""
@@ -32,6 +54,7 @@ def calculate_balance(address):
     
     balance = 0
     mining_rewards = 0
+    address_bytes = address.encode()
     
     for height in range(1, latest_height + 1):
         try:
@@ -42,22 +65,19 @@ def calculate_balance(address):
                 continue
                 
             for tx_b64 in txs:
-                # Decode the signed transaction
-                signed_tx = decode_transaction(tx_b64)
+                # Only coinbase transactions to our address have outputs we count
+                outputs = extract_coinbase_outputs(tx_b64, address, address_bytes)
+                if outputs is None:
+                    continue
                 
-                # Check if it's a coinbase transaction to our address
-                if signed_tx.get('algorithm') == 'coinbase' and signed_tx.get('signer_key') == address:
-                    # Decode the inner transaction
-                    inner_tx = decode_inner_transaction(signed_tx['transaction'])
-                    
-                    # Sum up outputs to our address
-                    for output in inner_tx.get('outputs', []):
-                        if output.get('address') == address:
-                            reward_amount = output.get('value', 0)
-                            balance += reward_amount
-                            mining_rewards += 1
-                            print(f"  🪙 Block {height}: +{reward_amount/100000000:.8f} SHADOW")
-                            
+                # Sum up outputs to our address
+                for output in outputs:
+                    if output.get('address') == address:
+                        reward_amount = output.get('value', 0)
+                        balance += reward_amount
+                        mining_rewards += 1
+                        print(f"  🪙 Block {height}: +{reward_amount/100000000:.8f} SHADOW")
+                        
         except Exception as e:
             print(f"❌ Error processing block {height}: {e}")
             continue
@@ -1,7 +1,11 @@
 #!/usr/bin/env python3
 """
-Shadowy Python CLI - Direct WASM integration using wasmtime
+Shadowy Python CLI - WASM integration via the Node.js bridge
 Ported from shadowy-cli Node.js implementation
+
+shadowy.wasm is built with GOOS=js: it imports the Go JS runtime (wasm_exec.js)
+and calls back into JS for crypto and HTTP, so it cannot be hosted in-process
+by wasmtime and is driven through wasm_bridge.js instead.
 """
 
 import click
@@ -9,81 +13,342 @@ import json
 import os
 import sys
 import time
+from datetime import datetime, timezone
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from pathlib import Path
-from typing import Dict, Any, Optional, List
+from types import MappingProxyType
+from operator import itemgetter
+from typing import Dict, Any, Optional, List, Callable, Tuple
 import secrets
 import hashlib
+import logging
+import random
+import re
 import subprocess
 import signal
 import atexit
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+
+# Progress chatter from the wrapper classes; silent below WARNING unless --verbose.
+# Only this logger writes to stdout next to the report - the root logger is left alone,
+# so third-party warnings (e.g. urllib3 retries) never land in the report
+log = logging.getLogger('shadowy')
+log.propagate = False
+_LOG_HANDLER = logging.StreamHandler(sys.stdout)
+_LOG_HANDLER.setFormatter(logging.Formatter('%(message)s'))
+
+# aiohttp is optional - without it the sync-status sweep runs on a thread pool over SESSION.
+# It costs more to import than the rest of the CLI together, so it is only loaded by
+# sync-status, via _load_aiohttp()
+aiohttp = None
+
+@functools.lru_cache(maxsize=None)
+def _load_aiohttp() -> bool:
+    """Import aiohttp into the module on first call; True if it is installed"""
+    global aiohttp
+    try:
+        import aiohttp
+    except ImportError:
+        return False
+    return True
+
+# NumPy is optional - it only speeds up bulk paths over many UTXOs, so it is loaded
+# by _load_numpy() once such a path is taken rather than on every invocation
+np = None
+
+@functools.lru_cache(maxsize=None)
+def _load_numpy() -> bool:
+    """Import numpy into the module on first call; True if it is installed"""
+    global np
+    try:
+        import numpy as np
+    except ImportError:
+        return False
+    return True
+
+# orjson (de)serializes bridge traffic several times faster and emits bytes directly;
+# stdlib json is the fallback
+try:
+    import orjson
+    json_loads = orjson.loads
+    json_dumps = orjson.dumps
+except ImportError:
+    orjson = None
+    json_loads = json.loads
+    
+    def json_dumps(obj: Any) -> bytes:
+        return json.dumps(obj).encode()
+
+# Reset endpoints that might exist on a node, in the order they are tried
+RESET_ENDPOINTS = [
+    "/api/v1/reset",
+    "/api/v1/sync/reset", 
+    "/api/v1/blockchain/reset",
+    "/api/v1/debug/reset",
+    "/api/v1/admin/reset-sync",
+    "/api/v1/mempool/clear",
+    "/api/v1/chain/restart",
+    "/api/v1/sync/restart", 
+    "/api/v1/node/restart",
+    "/reset",
+    "/debug/reset",
+    "/restart",
+    "/sync/reset"
+]
+
+# Methods tried, in order, against each reset endpoint that exists
+RESET_METHODS = ("POST", "GET")
+
+# Per-request timeouts (seconds) for the reset-sync flow
+RESET_PROBE_TIMEOUT = 5
+RESET_REQUEST_TIMEOUT = 5
+BASIC_CHECK_TIMEOUT = 10
+
+# Basic chain endpoints checked for connectivity when no reset endpoint works
+BASIC_ENDPOINTS = [
+    "/api/v1/status",
+    "/api/v1/health", 
+    "/api/v1/version"
+]
+
+_UTC = timezone.utc
+
+# Read-only default headers shared by every client instead of rebuilt per call
+_DEFAULT_HEADERS = MappingProxyType({
+    'Content-Type': 'application/json',
+    'User-Agent': 'Shadowy-Python-CLI/1.0'
+})
+
+# Bounded retry for direct node reads: gateway errors from a restarting node are
+# retried with exponential backoff rather than reported as endpoint failures
+NODE_RETRY_TOTAL = 2
+NODE_RETRY_BACKOFF = 0.2
+NODE_RETRY_STATUSES = (502, 503, 504)
+
+# Pooled session for direct node HTTP from the commands; the bridge keeps its own
+# session in ShadowyWASM so bridge RPCs are never retried
+SESSION = requests.Session()
+_node_adapter = HTTPAdapter(pool_connections=16, pool_maxsize=32,
+                            max_retries=Retry(total=NODE_RETRY_TOTAL,
+                                              backoff_factor=NODE_RETRY_BACKOFF,
+                                              status_forcelist=NODE_RETRY_STATUSES,
+                                              raise_on_status=False))
+SESSION.mount('http://', _node_adapter)
+SESSION.mount('https://', _node_adapter)
+SESSION.headers['User-Agent'] = _DEFAULT_HEADERS['User-Agent']
+
+# Built module shipped next to this package, resolved once per process
+WASM_PATH = (Path(__file__).parent.parent / 'shadowy-wasm' / 'shadowy.wasm').resolve(strict=False)
+
+# Shadowy addresses: 'S' followed by 50 alphanumerics (hex in practice)
+ADDR_LEN = 51
+_ADDR_RE = re.compile(rf'S[A-Za-z0-9]{{{ADDR_LEN - 1}}}')
+
+def validate_many(addresses: List[str]) -> List[bool]:
+    """Validate many addresses at once - one bool per input, in order"""
+    fullmatch = _ADDR_RE.fullmatch
+    return [fullmatch(a) is not None for a in addresses]
+
+# Satoshis per SHADOW
+SAT = 100_000_000
+
+def to_shadow(satoshis: int) -> float:
+    """Convert a satoshi amount to SHADOW"""
+    return satoshis / SAT
+
+def format_shadow(satoshis: int) -> str:
+    """Format a satoshi amount as SHADOW with full 8-decimal precision"""
+    return f"{satoshis / SAT:.8f}"
+
+# Change at or below this many satoshis is left to the fee rather than paying for an output
+CHANGE_DUST_LIMIT = 1000
+
+# Branch-and-bound coin selection gives up after this many search steps
+COIN_SELECTION_MAX_TRIES = 100000
+
+# Above this many UTXOs the ordering and running sums are computed with NumPy
+NUMPY_SELECTION_THRESHOLD = 512
+
+def _select_utxos(utxos: List[Dict[str, Any]], target: int) -> Tuple[List[Dict[str, Any]], int]:
+    """Select UTXOs covering target satoshis, preferring a changeless subset.
+    
+    Branch-and-bound first searches for a subset within CHANGE_DUST_LIMIT of the
+    target so no change output is created; if none is found within the try budget
+    it falls back to largest-first. Returns (selected, total) - total < target
+    means the UTXOs cannot cover it.
+    """
+    n = len(utxos)
+    prefix = None
+    if n > NUMPY_SELECTION_THRESHOLD and _load_numpy():
+        vals = np.fromiter((u.get("value", 0) for u in utxos), dtype=np.int64, count=n)
+        order = np.argsort(-vals, kind="stable")
+        sorted_vals = vals[order]
+        ordered = [utxos[i] for i in order.tolist()]
+        values = sorted_vals.tolist()
+        prefix = np.cumsum(sorted_vals)
+        remaining = (int(prefix[-1]) - np.concatenate(([0], prefix))).tolist()
+    else:
+        ordered = sorted(utxos, key=lambda u: u.get("value", 0), reverse=True)
+        values = [u.get("value", 0) for u in ordered]
+        
+        # remaining[i] = sum(values[i:]) prunes branches that can no longer reach target
+        remaining = [0] * (n + 1)
+        for i in range(n - 1, -1, -1):
+            remaining[i] = remaining[i + 1] + values[i]
+    if remaining[0] < target:
+        return ordered, remaining[0]
+    
+    upper = target + CHANGE_DUST_LIMIT
+    picked = []
+    total = 0
+    i = 0
+    for _ in range(COIN_SELECTION_MAX_TRIES):
+        if total + remaining[i] < target or total > upper:
+            # Dead branch: drop the most recent coin and explore omitting it
+            if not picked:
+                break
+            i = picked.pop()
+            total -= values[i]
+            i += 1
+        elif total >= target:
+            return [ordered[j] for j in picked], total
+        else:
+            picked.append(i)
+            total += values[i]
+            i += 1
+    
+    # No changeless subset - take the largest coins until the target is covered
+    if prefix is not None:
+        k = int(np.searchsorted(prefix, target)) + 1
+        return ordered[:k], int(prefix[k - 1])
+    
+    selected = []
+    total = 0
+    for utxo, value in zip(ordered, values):
+        selected.append(utxo)
+        total += value
+        if total >= target:
+            break
+    return selected, total
+
+# list_wallets summaries keyed by wallet path: (st_mtime_ns, summary); only the
+# public metadata is kept so key material never lingers in this cache. It is
+# persisted to ~/.shadowy/.cache/wallets.json so later CLI runs start warm.
+_WALLET_META_CACHE: Dict[str, Tuple[int, Dict[str, Any]]] = {}
+_wallet_meta_cache_loaded = False
+
+def _read_wallet_summary(wallet_file: str):
+    """Read one wallet file into its list_wallets summary, or return the error"""
+    try:
+        with open(wallet_file, 'rb') as f:
+            wallet_data = json_loads(f.read())
+        
+        return {
+            "name": wallet_data["name"],
+            "address": wallet_data["address"],
+            "created": wallet_data.get("created_at", 0),
+            "type": "Post-Quantum" if wallet_data.get("version") == 3 else f"v{wallet_data.get('version', 1)}"
+        }
+    except Exception as e:
+        return e
 
 class ShadowyWASM:
     """Shadowy WASM wrapper using Node.js bridge"""
     
+    __slots__ = ('current_client', 'current_wallet', 'wasm_bridge_process', 'wasm_bridge_url',
+                 '_wallet_dir', '_session', '_cache')
+    
     def __init__(self):
         self.current_client = None
+        self.current_wallet = None
         self.wasm_bridge_process = None
         self.wasm_bridge_url = "http://localhost:3333"
+        self._wallet_dir = Path.home() / '.shadowy'
+        
+        # Keep-alive session shared by every bridge/node call so chatty flows reuse one socket
+        self._session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16, max_retries=0)
+        self._session.mount('http://', adapter)
+        self._session.mount('https://', adapter)
+        self._session.headers.update(_DEFAULT_HEADERS)
+        self._session.headers['Connection'] = 'keep-alive'
+        
+        # Short-lived results of read-only RPCs, keyed by call: (fetched_at, result)
+        self._cache: Dict[str, Tuple[float, Any]] = {}
         
     def load_wasm(self, wasm_path: str):
         """Load the Shadowy WASM module via Node.js bridge"""
-        print("🔧 Starting Shadowy WASM engine...")
+        log.info("🔧 Starting Shadowy WASM engine...")
         
         if not os.path.exists(wasm_path):
-            print(f"❌ WASM file not found: {wasm_path}")
+            log.error("❌ WASM file not found: %s", wasm_path)
             return False
         
-        print(f"📦 WASM file: {os.path.basename(wasm_path)}")
+        log.info("📦 WASM file: %s", os.path.basename(wasm_path))
         
         # Start Node.js WASM bridge
         bridge_script = Path(__file__).parent / "wasm_bridge.js"
         if not bridge_script.exists():
-            print("❌ WASM bridge script not found")
+            log.error("❌ WASM bridge script not found")
             return False
         
         try:
-            print("🌉 Starting WASM bridge...")
+            log.info("🌉 Starting WASM bridge...")
+            env = os.environ.copy()
+            # Node >= 22.1 persists compiled bridge/wasm_exec.js code here across runs;
+            # older versions ignore the variable
+            env.setdefault('NODE_COMPILE_CACHE', str(self._wallet_dir / 'cache' / 'node'))
             self.wasm_bridge_process = subprocess.Popen(
                 ['node', str(bridge_script)],
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
+                env=env,
+                # Nothing reads the bridge output - a PIPE would fill and stall Node
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
                 preexec_fn=os.setsid if hasattr(os, 'setsid') else None
             )
             
             # Register cleanup function
             atexit.register(self._cleanup_bridge)
             
-            # Wait for bridge to start
-            print("⏳ Waiting for WASM bridge to initialize...")
-            time.sleep(3)
-            
-            # Test bridge connection
-            try:
-                response = requests.get(f"{self.wasm_bridge_url}/api/test", timeout=5)
-                if response.status_code == 404:  # 404 is expected, means server is running
-                    print("✅ WASM bridge ready")
+            # Poll until the bridge accepts connections instead of sleeping a fixed time
+            log.info("⏳ Waiting for WASM bridge to initialize...")
+            deadline = time.monotonic() + 10
+            delay = 0.05
+            while time.monotonic() < deadline:
+                if self.wasm_bridge_process.poll() is not None:
+                    log.error("❌ WASM bridge failed to start")
+                    return False
+                try:
+                    # Any HTTP response (404 is expected) means the server is listening
+                    self._session.get(f"{self.wasm_bridge_url}/api/test", timeout=0.5)
+                    log.info("✅ WASM bridge ready")
                     return True
-            except requests.exceptions.RequestException:
-                pass
+                except requests.exceptions.RequestException:
+                    time.sleep(delay)
+                    delay = min(delay * 1.7, 0.5)
             
             # Check if bridge process is still running
             if self.wasm_bridge_process.poll() is None:
-                print("✅ WASM bridge started")
+                log.info("✅ WASM bridge started")
                 return True
             else:
-                print("❌ WASM bridge failed to start")
+                log.error("❌ WASM bridge failed to start")
                 return False
                 
         except FileNotFoundError:
-            print("❌ Node.js not found. Please install Node.js to use WASM features.")
+            log.error("❌ Node.js not found. Please install Node.js to use WASM features.")
             return False
         except Exception as e:
-            print(f"❌ Failed to start WASM bridge: {e}")
+            log.error("❌ Failed to start WASM bridge: %s", e)
             return False
     
     def _cleanup_bridge(self):
         """Clean up the WASM bridge process"""
+        self._session.close()
         if self.wasm_bridge_process:
             try:
                 if hasattr(os, 'killpg'):
@@ -105,27 +370,37 @@ class ShadowyWASM:
         try:
             url = f"{self.wasm_bridge_url}/api/{endpoint}"
             if data:
-                response = requests.post(url, json=data, timeout=30)
+                # The session already sends Content-Type: application/json
+                response = self._session.post(url, data=json_dumps(data), timeout=30)
             else:
-                response = requests.get(url, timeout=30)
+                response = self._session.get(url, timeout=30)
             
             if response.status_code == 200:
-                return response.json()
+                return json_loads(response.content)
             else:
                 return {"error": f"WASM bridge error: HTTP {response.status_code}"}
-        except requests.exceptions.RequestException as e:
+        except (requests.exceptions.RequestException, ValueError) as e:
             return {"error": f"WASM bridge communication failed: {str(e)}"}
     
     
+    def _cached(self, key: str, ttl: float, fn: Callable[[], Dict[str, Any]]) -> Dict[str, Any]:
+        """Return fn() memoized for ttl seconds - error results are never cached"""
+        now = time.monotonic()
+        entry = self._cache.get(key)
+        if entry is not None and now - entry[0] < ttl:
+            return entry[1]
+        
+        value = fn()
+        if "error" not in value:
+            self._cache[key] = (now, value)
+        return value
+    
     def create_client(self, url: str) -> Dict[str, Any]:
         """Create HTTP client for blockchain node"""
         # Store client info locally
         self.current_client = {
             'url': url,
-            'headers': {
-                'Content-Type': 'application/json',
-                'User-Agent': 'Shadowy-Python-CLI/1.0'
-            }
+            'headers': _DEFAULT_HEADERS
         }
         
         # Also tell WASM bridge about the node URL
@@ -157,9 +432,9 @@ class ShadowyWASM:
             return {"error": "No client configured"}
         
         try:
-            # Use WASM bridge for balance lookup
-            result = self._call_wasm('get_balance', {'address': address})
-            return result
+            # Use WASM bridge for balance lookup - balances move on the order of seconds
+            return self._cached(f"bal:{address}", 1.0,
+                                lambda: self._call_wasm('get_balance', {'address': address}))
         except Exception as e:
             return {"error": str(e)}
     
@@ -170,7 +445,8 @@ class ShadowyWASM:
         
         try:
             # Get basic balance via WASM
-            balance_result = self._call_wasm('get_balance', {'address': address})
+            balance_result = self._cached(f"bal:{address}", 1.0,
+                                          lambda: self._call_wasm('get_balance', {'address': address}))
             if "error" in balance_result:
                 return {"error": f"Balance lookup failed: {balance_result['error']}"}
             
@@ -204,7 +480,11 @@ class ShadowyWASM:
         if not self.current_client:
             return {"error": "No client configured"}
         
-        print("🏥 Checking node health via WASM (PQC TLS)...")
+        return self._cached("health", 5.0, self._fetch_node_health)
+    
+    def _fetch_node_health(self) -> Dict[str, Any]:
+        """Uncached health check behind get_node_health"""
+        log.info("🏥 Checking node health via WASM (PQC TLS)...")
         
         # Use WASM bridge for health check 
         result = self._call_wasm('get_health')
@@ -233,16 +513,16 @@ class ShadowyWASM:
             return {"error": "No client configured"}
         
         try:
-            # Use WASM bridge for comprehensive node info
-            result = self._call_wasm('get_node_info')
-            return result
+            # The bridge already fetches everything in one GET /api/v1/node/info;
+            # share the reply for a few seconds like the health check
+            return self._cached("node_info", 5.0, lambda: self._call_wasm('get_node_info'))
         except Exception as e:
             return {"error": str(e)}
     
     def create_wallet(self, name: str) -> Dict[str, Any]:
         """Create a new wallet using WASM"""
-        print(f"🔑 Creating wallet: {name}")
-        print("🔒 Generating secure post-quantum key pair...")
+        log.info("🔑 Creating wallet: %s", name)
+        log.info("🔒 Generating secure post-quantum key pair...")
         
         # Use WASM to create wallet with real ML-DSA-87
         result = self._call_wasm('create_wallet', {'name': name})
@@ -250,7 +530,7 @@ class ShadowyWASM:
         if "error" in result:
             return {"error": result["error"]}
         
-        print(f"✅ Wallet created with real ML-DSA-87 cryptography")
+        log.info("✅ Wallet created with real ML-DSA-87 cryptography")
         return {
             "name": result["name"],
             "address": result["address"],
@@ -281,32 +561,91 @@ class ShadowyWASM:
     
     def list_wallets(self) -> Dict[str, Any]:
         """List all available wallets"""
-        wallet_dir = Path.home() / '.shadowy'
-        
-        if not wallet_dir.exists():
+        try:
+            # DirEntry caches its stat, so the mtime check costs no extra syscall on most platforms
+            with os.scandir(self._wallet_dir) as it:
+                entries = [e for e in it
+                           if e.name.startswith("shadowy-wallet-") and e.name.endswith(".json")]
+        except FileNotFoundError:
             return {"wallets": []}
         
-        wallets = []
-        for wallet_file in wallet_dir.glob("shadowy-wallet-*.json"):
+        self._load_wallet_meta_cache()
+        
+        # Drop entries for wallet files that no longer exist
+        present = {entry.path for entry in entries}
+        stale = [path for path in _WALLET_META_CACHE if path not in present]
+        for path in stale:
+            del _WALLET_META_CACHE[path]
+        dirty = bool(stale)
+        
+        # Unchanged files are served from the cache without re-reading them
+        slots: List[Any] = []
+        misses = []
+        for entry in entries:
+            wallet_file = entry.path
             try:
-                with open(wallet_file, 'r') as f:
-                    wallet_data = json.load(f)
-                
-                wallets.append({
-                    "name": wallet_data["name"],
-                    "address": wallet_data["address"],
-                    "created": wallet_data.get("created_at", 0),
-                    "type": "Post-Quantum" if wallet_data.get("version") == 3 else f"v{wallet_data.get('version', 1)}"
-                })
-                
-            except Exception as e:
-                print(f"❌ Error reading {wallet_file}: {e}")
+                mtime_ns = entry.stat(follow_symlinks=False).st_mtime_ns
+            except OSError as e:
+                log.error("❌ Error reading %s: %s", wallet_file, e)
+                continue
+            cached = _WALLET_META_CACHE.get(wallet_file)
+            if cached is not None and cached[0] == mtime_ns:
+                slots.append(cached[1])
+            else:
+                slots.append(None)
+                misses.append((len(slots) - 1, wallet_file, mtime_ns))
+        
+        # Changed files are read concurrently - the work is file I/O plus a JSON parse
+        if len(misses) > 1:
+            with ThreadPoolExecutor(max_workers=min(32, len(misses), (os.cpu_count() or 1) * 4)) as executor:
+                summaries = [*executor.map(_read_wallet_summary, [path for _, path, _ in misses])]
+        else:
+            summaries = [_read_wallet_summary(path) for _, path, _ in misses]
+        
+        for (slot, wallet_file, mtime_ns), summary in zip(misses, summaries):
+            if isinstance(summary, Exception):
+                log.error("❌ Error reading %s: %s", wallet_file, summary)
+                continue
+            _WALLET_META_CACHE[wallet_file] = (mtime_ns, summary)
+            slots[slot] = summary
+            dirty = True
+        
+        wallets = [summary for summary in slots if summary is not None]
+        
+        if dirty:
+            self._save_wallet_meta_cache()
         
         return {"wallets": wallets}
     
+    def _load_wallet_meta_cache(self):
+        """Seed _WALLET_META_CACHE from the copy persisted by an earlier run"""
+        global _wallet_meta_cache_loaded
+        if _wallet_meta_cache_loaded:
+            return
+        _wallet_meta_cache_loaded = True
+        try:
+            with open(self._wallet_dir / '.cache' / 'wallets.json', 'rb') as f:
+                stored = json_loads(f.read())
+            for path, (mtime_ns, summary) in stored.items():
+                _WALLET_META_CACHE.setdefault(path, (mtime_ns, summary))
+        except (OSError, ValueError, TypeError):
+            # Missing or corrupt cache - it is rebuilt by the next scan
+            pass
+    
+    def _save_wallet_meta_cache(self):
+        """Persist _WALLET_META_CACHE atomically; failures only cost a warm start"""
+        cache_dir = self._wallet_dir / '.cache'
+        try:
+            cache_dir.mkdir(exist_ok=True)
+            tmp_path = cache_dir / f'wallets.json.{os.getpid()}'
+            tmp_path.write_bytes(json_dumps(_WALLET_META_CACHE))
+            os.replace(tmp_path, cache_dir / 'wallets.json')
+        except OSError as e:
+            log.info("⚠️  Could not write wallet cache: %s", e)
+    
     def get_wallet_address(self) -> Dict[str, Any]:
         """Get current wallet address"""
-        if not hasattr(self, 'current_wallet') or not self.current_wallet:
+        if self.current_wallet is None:
             return {"error": "No wallet loaded"}
         
         return {
@@ -316,10 +655,10 @@ class ShadowyWASM:
     
     def sign_transaction(self, transaction_data: Dict[str, Any]) -> Dict[str, Any]:
         """Sign a transaction using WASM with real ML-DSA-87"""
-        if not hasattr(self, 'current_wallet') or not self.current_wallet:
+        if self.current_wallet is None:
             return {"error": "No wallet loaded"}
         
-        print("🔏 Signing transaction with real ML-DSA-87...")
+        log.info("🔏 Signing transaction with real ML-DSA-87...")
         
         # Use WASM to sign transaction with real cryptography
         result = self._call_wasm('sign_transaction', transaction_data)
@@ -327,7 +666,7 @@ class ShadowyWASM:
         if "error" in result:
             return {"error": result["error"]}
         
-        print(f"✅ Transaction signed with {len(result.get('signature', ''))} byte signature")
+        log.info("✅ Transaction signed with %s byte signature", len(result.get('signature', '')))
         
         return {
             "txid": result["txid"],
@@ -342,16 +681,21 @@ class ShadowyWASM:
         if not self.current_client:
             return {"error": "No client configured"}
         
-        if not hasattr(self, 'current_wallet') or not self.current_wallet:
+        if self.current_wallet is None:
             return {"error": "No wallet loaded"}
         
         try:
             from_address = self.current_wallet["address"]
             url = self.current_client['url']
             
-            print(f"💸 Preparing to send {amount} {'SHADOW' if not token_id else f'token {token_id[:16]}...'}")
-            print(f"📤 From: {from_address}")
-            print(f"📥 To: {to_address}")
+            # Reject malformed addresses before any UTXO lookup or WASM call
+            for addr, ok in zip((to_address, from_address), self.validate_addresses([to_address, from_address])):
+                if not ok:
+                    return {"error": f"Invalid address format: {addr}"}
+            
+            log.info("💸 Preparing to send %s %s", amount, f"token {token_id[:16]}..." if token_id else "SHADOW")
+            log.info("📤 From: %s", from_address)
+            log.info("📥 To: %s", to_address)
             
             # Step 1: Get UTXOs for the address  
             utxos_result = self.get_address_utxos(from_address)
@@ -362,35 +706,25 @@ class ShadowyWASM:
             if not utxos:
                 return {"error": "No spendable UTXOs found"}
             
-            print(f"💰 Found {len(utxos)} spendable UTXOs")
+            log.info("💰 Found %s spendable UTXOs", len(utxos))
             
             # Step 2: Build transaction using node's transaction creation utility
             # Convert amount to satoshis for SHADOW transactions
-            amount_satoshis = int(amount * 100000000) if not token_id else int(amount)
+            amount_satoshis = int(amount * SAT) if not token_id else int(amount)
             
             # Estimate fee (0.001 SHADOW = 100000 satoshis)
             estimated_fee = 100000
             
             # Select UTXOs - find enough to cover amount + fee
             total_needed = amount_satoshis + estimated_fee
-            selected_utxos = []
-            total_selected = 0
-            
-            # Sort by value descending
-            utxos.sort(key=lambda x: x.get("value", 0), reverse=True)
-            
-            for utxo in utxos:
-                selected_utxos.append(utxo)
-                total_selected += utxo.get("value", 0)
-                if total_selected >= total_needed:
-                    break
+            selected_utxos, total_selected = _select_utxos(utxos, total_needed)
             
             if total_selected < total_needed:
                 return {
                     "error": f"Insufficient funds: need {total_needed} satoshis, have {total_selected} satoshis"
                 }
             
-            print(f"✅ Selected {len(selected_utxos)} UTXOs totaling {total_selected/100000000:.8f} SHADOW")
+            log.info("✅ Selected %s UTXOs totaling %.8f SHADOW", len(selected_utxos), to_shadow(total_selected))
             
             # Step 3: Create transaction inputs from selected UTXOs
             inputs = []
@@ -403,23 +737,28 @@ class ShadowyWASM:
                 })
             
             # Step 4: Create transaction outputs
+            to_script = f"OP_DUP OP_HASH160 {to_address[1:41]} OP_EQUALVERIFY OP_CHECKSIG"
+            from_script = f"OP_DUP OP_HASH160 {from_address[1:41]} OP_EQUALVERIFY OP_CHECKSIG"
             outputs = []
             
             # Main output to recipient
             outputs.append({
                 "value": amount_satoshis,
-                "script_pubkey": f"OP_DUP OP_HASH160 {to_address[1:41]} OP_EQUALVERIFY OP_CHECKSIG",
+                "script_pubkey": to_script,
                 "address": to_address
             })
             
-            # Change output (if any)
+            # Change output (if any) - dust is not worth an output and goes to the fee
             change = total_selected - amount_satoshis - estimated_fee
-            if change > 0:
+            if change > CHANGE_DUST_LIMIT:
                 outputs.append({
                     "value": change,
-                    "script_pubkey": f"OP_DUP OP_HASH160 {from_address[1:41]} OP_EQUALVERIFY OP_CHECKSIG", 
+                    "script_pubkey": from_script,
                     "address": from_address
                 })
+            else:
+                estimated_fee += change
+                change = 0
             
             # Step 5: Add token operations if this is a token transaction
             token_ops = []
@@ -432,11 +771,11 @@ class ShadowyWASM:
                     "amount": int(amount)
                 })
             
-            print(f"🔧 Building transaction with {len(inputs)} inputs, {len(outputs)} outputs")
+            log.info("🔧 Building transaction with %s inputs, %s outputs", len(inputs), len(outputs))
             
             # Step 6: Skip node's transaction creation utility (may not be implemented)
             # and build transaction directly
-            print(f"🔧 Building transaction directly (bypassing node utility)")
+            log.info("🔧 Building transaction directly (bypassing node utility)")
             
             # Step 7: Sign transaction with our wallet
             # For now, use local signing since we need to implement wallet loading on node
@@ -445,7 +784,7 @@ class ShadowyWASM:
                 "inputs": inputs,
                 "outputs": outputs,
                 "locktime": 0,
-                "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
+                "timestamp": datetime.now(_UTC).strftime("%Y-%m-%dT%H:%M:%SZ")
             }
             
             # Add token operations only if they exist (tokens need different handling)
@@ -456,15 +795,18 @@ class ShadowyWASM:
             if "error" in signed_tx:
                 return signed_tx
             
-            print(f"✅ Transaction signed: {signed_tx['txid'][:16]}...")
+            log.info("✅ Transaction signed: %s...", signed_tx['txid'][:16])
             
             # Step 8: Submit to mempool via WASM (for PQC TLS compatibility)
-            print("📡 Broadcasting transaction via WASM...")
+            log.info("📡 Broadcasting transaction via WASM...")
             try:
                 # Use WASM broadcast function directly with the signed transaction result
                 broadcast_result = self._call_wasm('broadcast_transaction', signed_tx)
                 
                 if "error" not in broadcast_result:
+                    # Spent UTXOs and the old balance must not be served from cache
+                    self._cache.pop(f"bal:{from_address}", None)
+                    self._cache.pop(f"utxo:{from_address}", None)
                     return {
                         "success": True,
                         "txid": signed_tx["txid"],
@@ -473,8 +815,8 @@ class ShadowyWASM:
                         "to": to_address,
                         "amount": amount,
                         "asset": "SHADOW" if not token_id else f"token {token_id}",
-                        "fee": estimated_fee / 100000000,
-                        "change": change / 100000000 if change > 0 else 0,
+                        "fee": to_shadow(estimated_fee),
+                        "change": to_shadow(change),
                         "broadcast_response": broadcast_result
                     }
                 else:
@@ -509,7 +851,11 @@ class ShadowyWASM:
         if not self.current_client:
             return {"error": "No client configured"}
         
-        print(f"💰 Getting UTXOs for address via WASM (PQC TLS): {address[:20]}...")
+        return self._cached(f"utxo:{address}", 2.0, lambda: self._fetch_address_utxos(address))
+    
+    def _fetch_address_utxos(self, address: str) -> Dict[str, Any]:
+        """Uncached UTXO lookup behind get_address_utxos"""
+        log.info("💰 Getting UTXOs for address via WASM (PQC TLS): %s...", address[:20])
         
         try:
             # Use WASM bridge for UTXO lookup 
@@ -517,7 +863,7 @@ class ShadowyWASM:
             
             if "error" in result:
                 # If WASM fails, create mock UTXOs for testing
-                print(f"⚠️  WASM UTXO lookup failed ({result['error']}), using mock UTXOs for testing")
+                log.warning("⚠️  WASM UTXO lookup failed (%s), using mock UTXOs for testing", result['error'])
                 utxos = self._create_mock_utxos(address)
             else:
                 # WASM bridge returns UTXOS directly as an array
@@ -535,16 +881,16 @@ class ShadowyWASM:
                     if not isinstance(utxos, list):
                         utxos = []
                 except Exception as e:
-                    print(f"⚠️  UTXO type checking error ({str(e)}), using mock UTXOs")
+                    log.warning("⚠️  UTXO type checking error (%s), using mock UTXOs", e)
                     utxos = self._create_mock_utxos(address)
                     
                 # If no UTXOs from WASM, use mock for testing
                 if len(utxos) == 0:
-                    print("⚠️  No UTXOs from WASM, using mock UTXOs for testing")
+                    log.warning("⚠️  No UTXOs from WASM, using mock UTXOs for testing")
                     utxos = self._create_mock_utxos(address)
                     
         except Exception as e:
-            print(f"⚠️  WASM UTXO error ({str(e)}), using mock UTXOs for testing")
+            log.warning("⚠️  WASM UTXO error (%s), using mock UTXOs for testing", e)
             utxos = self._create_mock_utxos(address)
             
         return {
@@ -557,12 +903,13 @@ class ShadowyWASM:
     
     def _create_mock_utxos(self, address: str) -> List[Dict[str, Any]]:
         """Create mock UTXOs for testing purposes"""
+        script = f"OP_DUP OP_HASH160 {address[1:41]} OP_EQUALVERIFY OP_CHECKSIG"
         return [
             {
                 "txid": "a1b2c3d4e5f6789012345678901234567890abcdef1234567890abcdef123456",
                 "vout": 0,
                 "value": 1000000000,  # 10 SHADOW
-                "script_pubkey": f"OP_DUP OP_HASH160 {address[1:41]} OP_EQUALVERIFY OP_CHECKSIG",
+                "script_pubkey": script,
                 "address": address,
                 "confirmations": 10
             },
@@ -570,7 +917,7 @@ class ShadowyWASM:
                 "txid": "b2c3d4e5f6789012345678901234567890abcdef1234567890abcdef1234567a",
                 "vout": 1,
                 "value": 500000000,  # 5 SHADOW
-                "script_pubkey": f"OP_DUP OP_HASH160 {address[1:41]} OP_EQUALVERIFY OP_CHECKSIG",
+                "script_pubkey": script,
                 "address": address,
                 "confirmations": 20
             }
@@ -578,12 +925,15 @@ class ShadowyWASM:
     
     def validate_address(self, address: str) -> Dict[str, Any]:
         """Validate an address - using local validation since we do all operations via WASM"""
-        # Simple validation - addresses should be 51 chars starting with 'S'
-        if len(address) == 51 and address.startswith('S'):
+        if _ADDR_RE.fullmatch(address):
             return {"valid": True, "address": address}
         else:
             return {"valid": False, "error": "Invalid address format - should be 51 characters starting with 'S'"}
     
+    def validate_addresses(self, addresses: List[str]) -> List[bool]:
+        """Validate many addresses at once - one bool per input, in order"""
+        return validate_many(addresses)
+    
     def create_transaction(self, inputs: list, outputs: list, token_ops: list = None) -> Dict[str, Any]:
         """DEPRECATED: Transaction creation is now handled directly in WASM"""
         return {"error": "This method is deprecated - transaction creation is handled directly in WASM"}
@@ -603,92 +953,84 @@ class ShadowyWASM:
         """DEPRECATED: Transaction signing is now handled directly in WASM with ML-DSA-87"""
         return {"error": "This method is deprecated - transaction signing is handled directly in WASM with real ML-DSA-87 cryptography"}
     
+    def _head_status(self, url: str):
+        """HEAD an endpoint, returning its HTTP status or the connection error"""
+        try:
+            return self._session.head(url, timeout=RESET_PROBE_TIMEOUT).status_code
+        except requests.exceptions.RequestException as e:
+            return e
+    
     def reset_sync(self, node_url: str = None) -> Dict[str, Any]:
-        """Reset chain sync - uses direct requests for debugging when chain gets stuck"""
+        """Reset chain sync - uses direct requests for debugging when chain gets stuck
+        
+        Endpoints are probed with HEAD in parallel over the pooled session; reset
+        requests are still sent one at a time in RESET_ENDPOINTS order and stop at
+        the first success, so at most one reset action is triggered.
+        """
         if not node_url:
             if not self.current_client:
                 return {"error": "No node URL specified and no client configured"}
             node_url = self.current_client['url']
         
-        print(f"🔄 Attempting to reset chain sync at {node_url}")
-        print("⚠️  Using direct HTTP requests (bypassing WASM) for debugging...")
+        log.info("🔄 Attempting to reset chain sync at %s", node_url)
+        log.info("⚠️  Using direct HTTP requests (bypassing WASM) for debugging...")
+        log.info("🔍 Probing %s reset endpoints...", len(RESET_ENDPOINTS))
         
-        # Try multiple reset endpoints that might exist
-        reset_endpoints = [
-            "/api/v1/reset",
-            "/api/v1/sync/reset", 
-            "/api/v1/blockchain/reset",
-            "/api/v1/debug/reset",
-            "/api/v1/admin/reset-sync",
-            "/api/v1/mempool/clear",
-            "/api/v1/chain/restart",
-            "/api/v1/sync/restart", 
-            "/api/v1/node/restart",
-            "/reset",
-            "/debug/reset",
-            "/restart",
-            "/sync/reset"
-        ]
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            probes = [*executor.map(self._head_status, [f"{node_url}{endpoint}" for endpoint in RESET_ENDPOINTS])]
         
         results = []
         
-        for endpoint in reset_endpoints:
+        # Try multiple reset endpoints that might exist
+        for endpoint, probe in zip(RESET_ENDPOINTS, probes):
+            if isinstance(probe, Exception):
+                log.info("❌ %s: %s", endpoint, probe)
+                results.append({
+                    "endpoint": endpoint,
+                    "error": str(probe)
+                })
+                continue
+            
+            if probe == 404:
+                log.info("❌ %s: HTTP 404", endpoint)
+                results.append({
+                    "endpoint": endpoint,
+                    "status": 404,
+                    "error": "HTTP 404"
+                })
+                continue
+            
             try:
-                print(f"🔍 Trying {endpoint}...")
-                
-                # Try POST first
-                response = requests.post(f"{node_url}{endpoint}", 
-                                       json={"force": True, "reason": "chain_stuck"}, 
-                                       timeout=30)
+                log.info("🔍 Trying %s...", endpoint)
                 
-                if response.status_code in [200, 201, 202]:
-                    result = {
-                        "endpoint": endpoint,
-                        "method": "POST", 
-                        "status": response.status_code,
-                        "response": response.text[:200] if response.text else "No response body"
-                    }
-                    print(f"✅ SUCCESS: {endpoint} returned HTTP {response.status_code}")
-                    results.append(result)
-                    return {
-                        "success": True,
-                        "message": "Chain reset successful",
-                        "endpoint_used": endpoint,
-                        "method": "POST",
-                        "status_code": response.status_code,
-                        "response": response.text[:500] if response.text else None
-                    }
-                
-                # Try GET if POST fails
-                response = requests.get(f"{node_url}{endpoint}", timeout=30)
-                
-                if response.status_code in [200, 201, 202]:
-                    result = {
-                        "endpoint": endpoint,
-                        "method": "GET",
-                        "status": response.status_code, 
-                        "response": response.text[:200] if response.text else "No response body"
-                    }
-                    print(f"✅ SUCCESS: {endpoint} returned HTTP {response.status_code}")
-                    results.append(result)
-                    return {
-                        "success": True,
-                        "message": "Chain reset successful", 
-                        "endpoint_used": endpoint,
-                        "method": "GET",
-                        "status_code": response.status_code,
-                        "response": response.text[:500] if response.text else None
-                    }
+                # Try RESET_METHODS in order - bodies are streamed and only the first
+                # 500 bytes of a successful reply are ever read
+                for method in RESET_METHODS:
+                    body = {"force": True, "reason": "chain_stuck"} if method == "POST" else None
+                    with self._session.request(method, f"{node_url}{endpoint}", json=body,
+                                               timeout=RESET_REQUEST_TIMEOUT, stream=True) as response:
+                        status = response.status_code
+                        if status in [200, 201, 202]:
+                            snippet = next(response.iter_content(500), b"").decode("utf-8", "replace")
+                            log.info("✅ SUCCESS: %s returned HTTP %s", endpoint, status)
+                            return {
+                                "success": True,
+                                "message": "Chain reset successful",
+                                "endpoint_used": endpoint,
+                                "method": method,
+                                "status_code": status,
+                                "response": snippet or None
+                            }
                     
-                print(f"❌ {endpoint}: HTTP {response.status_code}")
+                log.info("❌ %s: HTTP %s", endpoint, status)
                 results.append({
                     "endpoint": endpoint,
-                    "status": response.status_code,
-                    "error": f"HTTP {response.status_code}"
+                    "status": status,
+                    "error": f"HTTP {status}"
                 })
                 
             except requests.exceptions.RequestException as e:
-                print(f"❌ {endpoint}: {str(e)}")
+                log.info("❌ %s: %s", endpoint, e)
                 results.append({
                     "endpoint": endpoint,
                     "error": str(e)
@@ -696,24 +1038,27 @@ class ShadowyWASM:
                 continue
         
         # If no reset endpoint worked, try some basic chain commands
-        basic_endpoints = [
-            "/api/v1/status",
-            "/api/v1/health", 
-            "/api/v1/version"
-        ]
+        log.info("🔍 No reset endpoints found, checking basic connectivity...")
         
-        print("🔍 No reset endpoints found, checking basic connectivity...")
-        for endpoint in basic_endpoints:
+        def check(endpoint):
             try:
-                response = requests.get(f"{node_url}{endpoint}", timeout=10)
-                print(f"📡 {endpoint}: HTTP {response.status_code}")
-                results.append({
-                    "endpoint": endpoint,
-                    "status": response.status_code,
-                    "connectivity": "ok" if response.status_code == 200 else "issues"
-                })
+                with self._session.get(f"{node_url}{endpoint}", timeout=BASIC_CHECK_TIMEOUT, stream=True) as response:
+                    return response.status_code
             except Exception as e:
-                print(f"❌ {endpoint}: {str(e)}")
+                return e
+        
+        with ThreadPoolExecutor(max_workers=len(BASIC_ENDPOINTS)) as executor:
+            statuses = [*executor.map(check, BASIC_ENDPOINTS)]
+        for endpoint, status in zip(BASIC_ENDPOINTS, statuses):
+            if isinstance(status, Exception):
+                log.info("❌ %s: %s", endpoint, status)
+                continue
+            log.info("📡 %s: HTTP %s", endpoint, status)
+            results.append({
+                "endpoint": endpoint,
+                "status": status,
+                "connectivity": "ok" if status == 200 else "issues"
+            })
         
         return {
             "success": False,
@@ -724,29 +1069,172 @@ class ShadowyWASM:
         }
 
 
+def _sync_probe_result(description: str, status_code: int, body: bytes):
+    """Turn one sync-status reply into its results entry and the line to report"""
+    if status_code == 200:
+        try:
+            return {
+                "status": "ok", 
+                "data": json_loads(body),
+                "description": description
+            }, f"   ✅ {description}: OK"
+        except ValueError:
+            return {
+                "status": "ok_no_json",
+                "data": body.decode("utf-8", "replace")[:200],
+                "description": description  
+            }, f"   ✅ {description}: OK (text response)"
+    return {
+        "status": "error",
+        "http_status": status_code,
+        "description": description
+    }, f"   ❌ {description}: HTTP {status_code}"
+
+def _sync_probe_failure(description: str, error: Exception):
+    """Results entry and report line for a sync-status endpoint that could not be reached"""
+    return {
+        "status": "failed", 
+        "error": str(error),
+        "description": description
+    }, f"   ❌ {description}: Connection failed - {str(error)[:50]}"
+
+async def _fetch_sync_endpoints(node: str, sync_endpoints: List[Tuple[str, str]]):
+    """Fetch every sync-status endpoint concurrently over one aiohttp session"""
+    async with aiohttp.ClientSession(
+        connector=aiohttp.TCPConnector(limit=len(sync_endpoints)),
+        headers={'User-Agent': _DEFAULT_HEADERS['User-Agent']}
+    ) as session:
+        async def fetch(endpoint, description):
+            # Same bounded policy as SESSION's Retry, with jitter so the nine probes
+            # don't hit a recovering node in lockstep
+            for attempt in range(NODE_RETRY_TOTAL + 1):
+                if attempt:
+                    await asyncio.sleep(NODE_RETRY_BACKOFF * (2 ** (attempt - 1)) * (0.5 + random.random()))
+                try:
+                    async with session.get(f"{node}{endpoint}", timeout=aiohttp.ClientTimeout(total=15)) as response:
+                        if response.status in NODE_RETRY_STATUSES and attempt < NODE_RETRY_TOTAL:
+                            continue
+                        return _sync_probe_result(description, response.status, await response.read())
+                except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                    if attempt == NODE_RETRY_TOTAL:
+                        return _sync_probe_failure(description, e)
+        
+        return await asyncio.gather(*[fetch(endpoint, description) for endpoint, description in sync_endpoints])
+
+
+# Status emoji shared by the render loops
+_ACCEPT_EMOJI = {"accepted": "✅", "pending": "⏳", "rejected": "❌", "unknown": "❓"}
+_SERVICE_EMOJI = {"healthy": "✅", "unhealthy": "❌", "degraded": "⚠️"}
+
+# Bridge records normally carry every field; these pull them in one C call and the
+# loops fall back to per-field .get() defaults only when one is missing
+_TOKEN_FIELDS = itemgetter("token_id", "name", "balance", "total_supply", "acceptance_state")
+_NFT_FIELDS = itemgetter("nft_id", "name", "collection", "acceptance_state")
+_UTXO_FIELDS = itemgetter("txid", "vout", "value", "confirmations")
+
+# One precompiled template per rendered item; the trailing newline is the blank
+# separator line once blocks are joined into the report
+_TOKEN_BLOCK = ("   {0} {1}\n"
+                "      Token ID: {2}\n"
+                "      Balance: {3:,.8f}\n"
+                "      Supply: {4:,.8f}\n"
+                "      Status: {5}\n").format
+_NFT_BLOCK = ("   {0} {1}\n"
+              "      NFT ID: {2}\n"
+              "      Collection: {3}\n"
+              "      Status: {4}\n").format
+
+def render_tokens(tokens: List[Dict[str, Any]]) -> List[str]:
+    """Render wallet token balances as one text block per token"""
+    blocks = []
+    for token in tokens:
+        try:
+            token_id, name, balance, supply, acceptance = _TOKEN_FIELDS(token)
+        except KeyError:
+            token_id = token.get("token_id", "Unknown")
+            name = token.get("name", token_id)
+            balance = token.get("balance", 0)
+            supply = token.get("total_supply", 0)
+            acceptance = token.get("acceptance_state", "unknown")
+        
+        acceptance_emoji = _ACCEPT_EMOJI.get(acceptance.lower(), "❓")
+        
+        blocks.append(_TOKEN_BLOCK(acceptance_emoji, name, token_id, balance, supply, acceptance.capitalize()))
+    return blocks
+
+def render_nfts(nfts: List[Dict[str, Any]]) -> List[str]:
+    """Render wallet NFT holdings as one text block per NFT"""
+    blocks = []
+    for nft in nfts:
+        try:
+            nft_id, name, collection, acceptance = _NFT_FIELDS(nft)
+        except KeyError:
+            nft_id = nft.get("nft_id", "Unknown")
+            name = nft.get("name", nft_id)
+            collection = nft.get("collection", "Uncategorized")
+            acceptance = nft.get("acceptance_state", "unknown")
+        
+        acceptance_emoji = _ACCEPT_EMOJI.get(acceptance.lower(), "❓")
+        
+        blocks.append(_NFT_BLOCK(acceptance_emoji, name, nft_id, collection, acceptance.capitalize()))
+    return blocks
+
+_WASM: Optional[ShadowyWASM] = None
+
+def emit_json(obj: Any) -> None:
+    """Write obj as one line of JSON straight to the stdout byte stream for --json callers"""
+    sys.stdout.flush()
+    sys.stdout.buffer.write(json_dumps(obj) + b"\n")
+    sys.stdout.buffer.flush()
+
+def _json_flag(ctx, param, value):
+    """--json callback: keep stdout for the JSON payload by moving log output to stderr"""
+    if value:
+        _LOG_HANDLER.setStream(sys.stderr)
+    return value
+
+# Shared by every command that can print its raw result instead of a report
+json_option = click.option('--json', 'as_json', is_flag=True, callback=_json_flag,
+                           help='Print the raw result as JSON')
+
+def get_or_init_wasm() -> ShadowyWASM:
+    """Return the process-wide ShadowyWASM, starting the bridge on first use"""
+    global _WASM
+    if _WASM is None:
+        wasm = ShadowyWASM()
+        if not wasm.load_wasm(str(WASM_PATH)):
+            sys.exit(1)
+        _WASM = wasm
+    return _WASM
+
+def needs_node(fn):
+    """Call a command with a loaded ShadowyWASM already connected to its --node"""
+    @functools.wraps(fn)
+    def wrapper(**kwargs):
+        wasm = get_or_init_wasm()
+        result = wasm.create_client(kwargs['node'])
+        if not result["success"]:
+            print(f"❌ Failed to connect to node: {result['error']}")
+            print(f"🌐 Node URL: {kwargs['node']}")
+            sys.exit(1)
+        return fn(wasm, **kwargs)
+    return wrapper
+
+
 @click.group()
-def cli():
+@click.option('--verbose', '-v', is_flag=True, help='Show progress output from WASM and node calls')
+def cli(verbose):
     """Shadowy Python CLI - Post-quantum blockchain client"""
-    pass
+    if _LOG_HANDLER not in log.handlers:
+        log.addHandler(_LOG_HANDLER)
+    log.setLevel(logging.INFO if verbose else logging.WARNING)
 
 @cli.command()
 @click.argument('address')
 @click.option('--node', default='http://127.0.0.1:8080', help='Node URL')
-def balance(address, node):
+@needs_node
+def balance(wasm, address, node):
     """Get balance for an address"""
-    wasm = ShadowyWASM()
-    
-    # Load WASM
-    wasm_path = Path(__file__).parent.parent / 'shadowy-wasm' / 'shadowy.wasm'
-    if not wasm.load_wasm(str(wasm_path)):
-        sys.exit(1)
-    
-    # Create client
-    result = wasm.create_client(node)
-    if not result["success"]:
-        print(f"❌ Failed to connect: {result['error']}")
-        sys.exit(1)
-    
     # Get balance
     print(f"\n💰 Getting balance for address: {address[:20]}...")
     balance_result = wasm.get_balance(address)
@@ -863,21 +1351,10 @@ def address(wallet):
 @wallet.command()
 @click.option('-w', '--wallet', required=True, help='Wallet name to check balance for')
 @click.option('--node', default='http://127.0.0.1:8080', help='Node URL')
-def balance(wallet, node):
+@json_option
+@needs_node
+def balance(wasm, wallet, node, as_json):
     """Show detailed wallet balance including SHADOW, tokens, and NFTs"""
-    wasm = ShadowyWASM()
-    
-    # Load WASM
-    wasm_path = Path(__file__).parent.parent / 'shadowy-wasm' / 'shadowy.wasm'
-    if not wasm.load_wasm(str(wasm_path)):
-        sys.exit(1)
-    
-    # Create client
-    result = wasm.create_client(node)
-    if not result["success"]:
-        print(f"❌ Failed to connect to node: {result['error']}")
-        sys.exit(1)
-    
     # Load wallet to get address
     load_result = wasm.load_wallet(wallet)
     if "error" in load_result:
@@ -885,9 +1362,10 @@ def balance(wallet, node):
         sys.exit(1)
     
     address = load_result["address"]
-    print(f"💰 Getting wallet balance for: {wallet}")
-    print(f"📍 Address: {address[:20]}...")
-    print()
+    if not as_json:
+        print(f"💰 Getting wallet balance for: {wallet}")
+        print(f"📍 Address: {address[:20]}...")
+        print()
     
     # Get detailed balance
     balance_result = wasm.get_wallet_balance(address)
@@ -896,6 +1374,12 @@ def balance(wallet, node):
         print(f"❌ Error: {balance_result['error']}")
         sys.exit(1)
     
+    if as_json:
+        emit_json({"wallet": wallet, "address": address, **balance_result})
+        return
+    
+    # Rendered into one buffer and written with a single print
+    out = []
     # Display SHADOW balance
     shadow_balance = balance_result.get("shadow_balance", 0)
     confirmed_satoshis = balance_result.get("confirmed_satoshis", 0)
@@ -904,77 +1388,41 @@ def balance(wallet, node):
     total_sent = balance_result.get("total_sent_satoshis", 0)
     tx_count = balance_result.get("transaction_count", 0)
     
-    print("💎 SHADOW Balance:")
-    print(f"   Total: {shadow_balance:.8f} SHADOW")
-    print(f"   Confirmed: {(confirmed_satoshis / 100000000):.8f} SHADOW")
-    print(f"   Pending: {(unconfirmed_satoshis / 100000000):.8f} SHADOW")
-    print(f"   Total Received: {(total_received / 100000000):.8f} SHADOW") 
-    print(f"   Total Sent: {(total_sent / 100000000):.8f} SHADOW")
-    print(f"   Transactions: {tx_count}")
-    print()
+    out.append("💎 SHADOW Balance:")
+    out.append(f"   Total: {shadow_balance:.8f} SHADOW")
+    out.append(f"   Confirmed: {format_shadow(confirmed_satoshis)} SHADOW")
+    out.append(f"   Pending: {format_shadow(unconfirmed_satoshis)} SHADOW")
+    out.append(f"   Total Received: {format_shadow(total_received)} SHADOW")
+    out.append(f"   Total Sent: {format_shadow(total_sent)} SHADOW")
+    out.append(f"   Transactions: {tx_count}")
+    out.append("")
     
     # Display token balances
     tokens = balance_result.get("tokens", [])
     if tokens:
-        print("🪙 Token Balances:")
-        for token in tokens:
-            token_id = token.get("token_id", "Unknown")
-            token_name = token.get("name", token_id)
-            token_balance = token.get("balance", 0)
-            token_supply = token.get("total_supply", 0)
-            acceptance = token.get("acceptance_state", "unknown")
-            
-            # Format acceptance state with emoji
-            acceptance_emoji = {
-                "accepted": "✅",
-                "pending": "⏳", 
-                "rejected": "❌",
-                "unknown": "❓"
-            }.get(acceptance.lower(), "❓")
-            
-            print(f"   {acceptance_emoji} {token_name}")
-            print(f"      Token ID: {token_id}")
-            print(f"      Balance: {token_balance:,.8f}")
-            print(f"      Supply: {token_supply:,.8f}")
-            print(f"      Status: {acceptance.capitalize()}")
-            print()
+        out.append("🪙 Token Balances:")
+        out.extend(render_tokens(tokens))
     else:
-        print("🪙 Token Balances: None")
-        print()
+        out.append("🪙 Token Balances: None")
+        out.append("")
     
     # Display NFT holdings
     nfts = balance_result.get("nfts", [])
     if nfts:
-        print("🖼️  NFT Holdings:")
-        for nft in nfts:
-            nft_id = nft.get("nft_id", "Unknown")
-            nft_name = nft.get("name", nft_id)
-            nft_collection = nft.get("collection", "Uncategorized")
-            acceptance = nft.get("acceptance_state", "unknown")
-            
-            # Format acceptance state with emoji
-            acceptance_emoji = {
-                "accepted": "✅",
-                "pending": "⏳",
-                "rejected": "❌", 
-                "unknown": "❓"
-            }.get(acceptance.lower(), "❓")
-            
-            print(f"   {acceptance_emoji} {nft_name}")
-            print(f"      NFT ID: {nft_id}")
-            print(f"      Collection: {nft_collection}")
-            print(f"      Status: {acceptance.capitalize()}")
-            print()
+        out.append("🖼️  NFT Holdings:")
+        out.extend(render_nfts(nfts))
     else:
-        print("🖼️  NFT Holdings: None")
-        print()
+        out.append("🖼️  NFT Holdings: None")
+        out.append("")
     
     # Summary
     total_assets = len(tokens) + len(nfts)
     if total_assets > 0:
-        print(f"📊 Summary: {shadow_balance:.4f} SHADOW + {len(tokens)} tokens + {len(nfts)} NFTs")
+        out.append(f"📊 Summary: {shadow_balance:.4f} SHADOW + {len(tokens)} tokens + {len(nfts)} NFTs")
     else:
-        print(f"📊 Summary: {shadow_balance:.4f} SHADOW only")
+        out.append(f"📊 Summary: {shadow_balance:.4f} SHADOW only")
+    
+    print("\n".join(out))
 
 @wallet.command()
 @click.argument('to_address')
@@ -982,21 +1430,9 @@ def balance(wallet, node):
 @click.option('-w', '--wallet', required=True, help='Wallet name to send from')
 @click.option('--token', help='Token ID to send (default: SHADOW)')
 @click.option('--node', default='http://127.0.0.1:8080', help='Node URL')
-def send(to_address, amount, wallet, token, node):
+@needs_node
+def send(wasm, to_address, amount, wallet, token, node):
     """Send SHADOW or tokens to another address"""
-    wasm = ShadowyWASM()
-    
-    # Load WASM
-    wasm_path = Path(__file__).parent.parent / 'shadowy-wasm' / 'shadowy.wasm'
-    if not wasm.load_wasm(str(wasm_path)):
-        sys.exit(1)
-    
-    # Create client
-    result = wasm.create_client(node)
-    if not result["success"]:
-        print(f"❌ Failed to connect to node: {result['error']}")
-        sys.exit(1)
-    
     # Load wallet
     load_result = wasm.load_wallet(wallet)
     if "error" in load_result:
@@ -1004,7 +1440,7 @@ def send(to_address, amount, wallet, token, node):
         sys.exit(1)
     
     # Validate addresses
-    if not to_address.startswith('S') or len(to_address) != 51:
+    if not _ADDR_RE.fullmatch(to_address):
         print(f"❌ Invalid recipient address format: {to_address}")
         print("💡 Addresses should start with 'S' and be 51 characters long")
         sys.exit(1)
@@ -1070,22 +1506,9 @@ def send(to_address, amount, wallet, token, node):
 @cli.command()
 @click.option('--node', default='http://127.0.0.1:8080', help='Node URL')
 @click.option('--detailed', '-d', is_flag=True, help='Show detailed node information')
-def health(node, detailed):
+@needs_node
+def health(wasm, node, detailed):
     """Check node health status"""
-    wasm = ShadowyWASM()
-    
-    # Load WASM
-    wasm_path = Path(__file__).parent.parent / 'shadowy-wasm' / 'shadowy.wasm'
-    if not wasm.load_wasm(str(wasm_path)):
-        sys.exit(1)
-    
-    # Create client
-    result = wasm.create_client(node)
-    if not result["success"]:
-        print(f"❌ Failed to connect to node: {result['error']}")
-        print(f"🌐 Node URL: {node}")
-        sys.exit(1)
-    
     if detailed:
         # Get comprehensive node information
         print(f"🔍 Getting detailed node information from: {node}")
@@ -1096,68 +1519,72 @@ def health(node, detailed):
             print(f"❌ Error: {node_info['error']}")
             sys.exit(1)
         
+        # Rendered into one buffer and written with a single print
+        out = []
         # Health section
         health_data = node_info.get("health", {})
         is_healthy = health_data.get("healthy", False)
         health_emoji = "✅" if is_healthy else "❌"
         
-        print(f"{health_emoji} Node Health: {'Healthy' if is_healthy else 'Unhealthy'}")
-        print(f"   Status: {health_data.get('status', 'unknown')}")
-        print(f"   URL: {node_info.get('node_url', node)}")
-        print()
+        out.append(f"{health_emoji} Node Health: {'Healthy' if is_healthy else 'Unhealthy'}")
+        out.append(f"   Status: {health_data.get('status', 'unknown')}")
+        out.append(f"   URL: {node_info.get('node_url', node)}")
+        out.append("")
         
         # Services section
         services = health_data.get("services", {})
         if services:
-            print("🔧 Services Status:")
+            out.append("🔧 Services Status:")
             for service_name, service_info in services.items():
                 if isinstance(service_info, dict):
                     status = service_info.get("status", "unknown")
-                    status_emoji = {"healthy": "✅", "unhealthy": "❌", "degraded": "⚠️"}.get(status, "❓")
-                    print(f"   {status_emoji} {service_name.capitalize()}: {status.capitalize()}")
+                    status_emoji = _SERVICE_EMOJI.get(status, "❓")
+                    out.append(f"   {status_emoji} {service_name.capitalize()}: {status.capitalize()}")
                     
                     # Show metrics if available
                     metrics = service_info.get("metrics", {})
                     if metrics:
                         for key, value in metrics.items():
                             if isinstance(value, (int, float)):
-                                print(f"      {key}: {value:,}")
+                                out.append(f"      {key}: {value:,}")
                             else:
-                                print(f"      {key}: {value}")
+                                out.append(f"      {key}: {value}")
                 else:
-                    print(f"   ❓ {service_name.capitalize()}: {service_info}")
-            print()
+                    out.append(f"   ❓ {service_name.capitalize()}: {service_info}")
+            out.append("")
         
         # Version information
         version_data = node_info.get("version", {})
         if version_data:
-            print("📋 Version Information:")
-            print(f"   Version: {version_data.get('version', 'unknown')}")
-            print(f"   Build: {version_data.get('build', 'unknown')}")
-            print(f"   Go Version: {version_data.get('go_version', 'unknown')}")
-            print()
+            out.append("📋 Version Information:")
+            out.append(f"   Version: {version_data.get('version', 'unknown')}")
+            out.append(f"   Build: {version_data.get('build', 'unknown')}")
+            out.append(f"   Go Version: {version_data.get('go_version', 'unknown')}")
+            out.append("")
         
         # Blockchain information  
         blockchain_data = node_info.get("blockchain", {})
         if blockchain_data:
-            print("⛓️  Blockchain Status:")
-            print(f"   Chain Height: {blockchain_data.get('tip_height', 0):,}")
-            print(f"   Total Blocks: {blockchain_data.get('total_blocks', 0):,}")
-            print(f"   Total Transactions: {blockchain_data.get('total_transactions', 0):,}")
-            print(f"   Chain ID: {blockchain_data.get('chain_id', 'unknown')}")
-            print()
+            out.append("⛓️  Blockchain Status:")
+            out.append(f"   Chain Height: {blockchain_data.get('tip_height', 0):,}")
+            out.append(f"   Total Blocks: {blockchain_data.get('total_blocks', 0):,}")
+            out.append(f"   Total Transactions: {blockchain_data.get('total_transactions', 0):,}")
+            out.append(f"   Chain ID: {blockchain_data.get('chain_id', 'unknown')}")
+            out.append("")
         
         # Node status
         status_data = node_info.get("status", {})
         if status_data:
-            print("📊 Node Status:")
-            print(f"   Node ID: {status_data.get('node_id', 'unknown')}")
-            print(f"   Uptime: {status_data.get('uptime', 'unknown')}")
+            out.append("📊 Node Status:")
+            out.append(f"   Node ID: {status_data.get('node_id', 'unknown')}")
+            out.append(f"   Uptime: {status_data.get('uptime', 'unknown')}")
             
             node_services = status_data.get("services", {})
             if node_services:
                 enabled_services = [name for name, enabled in node_services.items() if enabled]
-                print(f"   Enabled Services: {', '.join(enabled_services)}")
+                out.append(f"   Enabled Services: {', '.join(enabled_services)}")
+        
+        print("\n".join(out))
     
     else:
         # Simple health check
@@ -1178,19 +1605,13 @@ def health(node, detailed):
         # Count healthy/unhealthy services
         services = health_result.get("services", {})
         if services:
-            healthy_count = 0
-            total_count = len(services)
-            
-            for service_info in services.values():
-                if isinstance(service_info, dict):
-                    if service_info.get("status") == "healthy":
-                        healthy_count += 1
-                else:
-                    # Assume boolean or simple status
-                    if service_info:
-                        healthy_count += 1
+            # Dict entries carry a status; anything else is a boolean or simple status
+            healthy_count = sum(
+                1 for service_info in services.values()
+                if (service_info.get("status") == "healthy" if isinstance(service_info, dict) else service_info)
+            )
             
-            print(f"   Services: {healthy_count}/{total_count} healthy")
+            print(f"   Services: {healthy_count}/{len(services)} healthy")
         
         if not is_healthy:
             print()
@@ -1199,29 +1620,19 @@ def health(node, detailed):
 @cli.command()
 @click.argument('address')
 @click.option('--node', default='http://127.0.0.1:8080', help='Node URL')
-def utxos(address, node):
+@json_option
+@needs_node
+def utxos(wasm, address, node, as_json):
     """Show unspent transaction outputs (UTXOs) for an address"""
-    wasm = ShadowyWASM()
-    
-    # Load WASM
-    wasm_path = Path(__file__).parent.parent / 'shadowy-wasm' / 'shadowy.wasm'
-    if not wasm.load_wasm(str(wasm_path)):
-        sys.exit(1)
-    
-    # Create client
-    result = wasm.create_client(node)
-    if not result["success"]:
-        print(f"❌ Failed to connect to node: {result['error']}")
-        sys.exit(1)
-    
     # Validate address format
-    if not address.startswith('S') or len(address) != 51:
+    if not _ADDR_RE.fullmatch(address):
         print(f"❌ Invalid address format: {address}")
         print("💡 Addresses should start with 'S' and be 51 characters long")
         sys.exit(1)
     
-    print(f"🔍 Getting UTXOs for address: {address[:20]}...")
-    print()
+    if not as_json:
+        print(f"🔍 Getting UTXOs for address: {address[:20]}...")
+        print()
     
     # Get UTXOs
     utxo_result = wasm.get_address_utxos(address)
@@ -1230,6 +1641,10 @@ def utxos(address, node):
         print(f"❌ Error: {utxo_result['error']}")
         sys.exit(1)
     
+    if as_json:
+        emit_json(utxo_result)
+        return
+    
     utxos = utxo_result.get("utxos", [])
     total_value = utxo_result.get("total_value", 0)
     
@@ -1237,45 +1652,40 @@ def utxos(address, node):
         print("📭 No unspent outputs found for this address")
         return
     
-    print(f"💰 Found {len(utxos)} unspent output(s):")
-    print()
-    
-    for i, utxo in enumerate(utxos, 1):
-        tx_id = utxo.get("txid", "")
-        vout = utxo.get("vout", 0)
-        value = utxo.get("value", 0)
-        confirmations = utxo.get("confirmations", 0)
-        
-        shadow_value = value / 100000000  # Convert satoshis to SHADOW
-        
-        print(f"🔗 UTXO #{i}:")
-        print(f"   Transaction: {tx_id}")
-        print(f"   Output Index: {vout}")
-        print(f"   Value: {shadow_value:.8f} SHADOW ({value:,} satoshis)")
-        print(f"   Confirmations: {confirmations}")
-        print()
-    
-    total_shadow = total_value / 100000000
-    print(f"📊 Total Spendable: {total_shadow:.8f} SHADOW ({total_value:,} satoshis)")
+    rows = []
+    for utxo in utxos:
+        try:
+            rows.append(_UTXO_FIELDS(utxo))
+        except KeyError:
+            rows.append((utxo.get("txid", ""), utxo.get("vout", 0),
+                         utxo.get("value", 0), utxo.get("confirmations", 0)))
+    
+    # Convert satoshis to SHADOW in one vectorized pass for large sets when NumPy is available
+    values = [row[2] for row in rows]
+    if len(values) > NUMPY_SELECTION_THRESHOLD and _load_numpy():
+        shadow_values = (np.array(values, dtype=np.int64) / SAT).tolist()
+    else:
+        shadow_values = [to_shadow(value) for value in values]
+    
+    # Rendered into one buffer and written with a single print
+    out = [f"💰 Found {len(utxos)} unspent output(s):", ""]
+    for i, ((tx_id, vout, value, confirmations), shadow_value) in enumerate(zip(rows, shadow_values), 1):
+        out.append(f"🔗 UTXO #{i}:")
+        out.append(f"   Transaction: {tx_id}")
+        out.append(f"   Output Index: {vout}")
+        out.append(f"   Value: {shadow_value:.8f} SHADOW ({value:,} satoshis)")
+        out.append(f"   Confirmations: {confirmations}")
+        out.append("")
+    
+    out.append(f"📊 Total Spendable: {format_shadow(total_value)} SHADOW ({total_value:,} satoshis)")
+    print("\n".join(out))
 
 @cli.command()
 @click.argument('address')
 @click.option('--node', default='http://127.0.0.1:8080', help='Node URL')
-def validate(address, node):
+@needs_node
+def validate(wasm, address, node):
     """Validate an address format"""
-    wasm = ShadowyWASM()
-    
-    # Load WASM
-    wasm_path = Path(__file__).parent.parent / 'shadowy-wasm' / 'shadowy.wasm'
-    if not wasm.load_wasm(str(wasm_path)):
-        sys.exit(1)
-    
-    # Create client
-    result = wasm.create_client(node)
-    if not result["success"]:
-        print(f"❌ Failed to connect to node: {result['error']}")
-        sys.exit(1)
-    
     print(f"🔍 Validating address: {address}")
     print()
     
@@ -1309,10 +1719,9 @@ def test():
     wasm = ShadowyWASM()
     
     # Test WASM loading
-    wasm_path = Path(__file__).parent.parent / 'shadowy-wasm' / 'shadowy.wasm'
-    print(f"📁 WASM path: {wasm_path}")
+    print(f"📁 WASM path: {WASM_PATH}")
     
-    if wasm.load_wasm(str(wasm_path)):
+    if wasm.load_wasm(str(WASM_PATH)):
         print("✅ WASM loading successful")
     else:
         print("❌ WASM loading failed")
@@ -1377,14 +1786,16 @@ def reset_sync(node):
 
 @cli.command('sync-status')  
 @click.option('--node', default='http://127.0.0.1:8080', help='Node URL to check')
-def sync_status(node):
+@json_option
+def sync_status(node, as_json):
     """Check blockchain sync status and diagnose sync issues"""
     wasm = ShadowyWASM()
     
-    print("🔄 Blockchain Sync Diagnostics")
-    print("=" * 50)
-    print("⚠️  Using direct HTTP requests for detailed sync analysis")
-    print()
+    if not as_json:
+        print("🔄 Blockchain Sync Diagnostics")
+        print("=" * 50)
+        print("⚠️  Using direct HTTP requests for detailed sync analysis")
+        print()
     
     # Check multiple sync-related endpoints
     sync_endpoints = [
@@ -1399,121 +1810,108 @@ def sync_status(node):
         ("/api/v1/network", "Network Info")
     ]
     
-    results = {}
-    
-    for endpoint, description in sync_endpoints:
+    def probe(endpoint, description):
+        """Fetch one endpoint, returning its results entry and the line to report"""
         try:
-            print(f"🔍 Checking {description}...")
-            response = requests.get(f"{node}{endpoint}", timeout=15)
-            
-            if response.status_code == 200:
-                try:
-                    data = response.json()
-                    results[endpoint] = {
-                        "status": "ok", 
-                        "data": data,
-                        "description": description
-                    }
-                    print(f"   ✅ {description}: OK")
-                except:
-                    results[endpoint] = {
-                        "status": "ok_no_json",
-                        "data": response.text[:200],
-                        "description": description  
-                    }
-                    print(f"   ✅ {description}: OK (text response)")
-            else:
-                results[endpoint] = {
-                    "status": "error",
-                    "http_status": response.status_code,
-                    "description": description
-                }
-                print(f"   ❌ {description}: HTTP {response.status_code}")
-                
+            response = SESSION.get(f"{node}{endpoint}", timeout=15)
+            return _sync_probe_result(description, response.status_code, response.content)
         except requests.exceptions.RequestException as e:
-            results[endpoint] = {
-                "status": "failed", 
-                "error": str(e),
-                "description": description
-            }
-            print(f"   ❌ {description}: Connection failed - {str(e)[:50]}")
+            return _sync_probe_failure(description, e)
+    
+    # All endpoints are fetched concurrently so the sweep costs ~1 RTT instead of 9 -
+    # on one aiohttp event loop when available, else on a thread pool over SESSION.
+    # Results are reported in the fixed order above
+    if not as_json:
+        print(f"🔍 Checking {len(sync_endpoints)} endpoints...")
+    if _load_aiohttp():
+        probes = asyncio.run(_fetch_sync_endpoints(node, sync_endpoints))
+    else:
+        with ThreadPoolExecutor(max_workers=len(sync_endpoints)) as executor:
+            probes = [*executor.map(probe, *zip(*sync_endpoints))]
+    
+    results = {endpoint: result for (endpoint, _), (result, _) in zip(sync_endpoints, probes)}
+    if as_json:
+        emit_json(results)
+        return
+    
+    # Every result is in hand, so the per-endpoint lines and the analysis are
+    # rendered into one buffer and written with a single print
+    out = [line for _, line in probes]
+    out.append("\n📊 Sync Analysis:")
+    out.append("=" * 30)
     
-    print("\n📊 Sync Analysis:")
-    print("=" * 30)
+    # Every endpoint has an entry once the sweep completes, so one pass covers all checks
+    oks = {endpoint: result["status"] == "ok" for endpoint, result in results.items()}
+    data = {endpoint: result.get("data") for endpoint, result in results.items()}
+    health_ok = oks["/api/v1/health"]
+    status_ok = oks["/api/v1/status"]
+    blockchain_ok = oks["/api/v1/blockchain"]
+    peer_count = len(data["/api/v1/peers"].get("peers", [])) if oks["/api/v1/peers"] else 0
     
     # Analyze the results
-    if "/api/v1/blockchain" in results and results["/api/v1/blockchain"]["status"] == "ok":
-        blockchain_data = results["/api/v1/blockchain"]["data"]
+    if blockchain_ok:
+        blockchain_data = data["/api/v1/blockchain"]
         latest_height = blockchain_data.get("latest_height", 0)
         latest_hash = blockchain_data.get("latest_block_hash", "unknown")
-        print(f"🔗 Latest Block Height: {latest_height}")
-        print(f"🧩 Latest Block Hash: {latest_hash[:16]}...")
+        out.append(f"🔗 Latest Block Height: {latest_height}")
+        out.append(f"🧩 Latest Block Hash: {latest_hash[:16]}...")
         
         # Check if we're syncing
         syncing = blockchain_data.get("syncing", False)
         if syncing:
-            print("⏳ Status: SYNCING")
+            out.append("⏳ Status: SYNCING")
             sync_height = blockchain_data.get("sync_height", 0)
             if sync_height > 0:
                 progress = (latest_height / sync_height) * 100 if sync_height > 0 else 0
-                print(f"📈 Sync Progress: {progress:.1f}% ({latest_height}/{sync_height})")
+                out.append(f"📈 Sync Progress: {progress:.1f}% ({latest_height}/{sync_height})")
         else:
-            print("✅ Status: SYNCED")
+            out.append("✅ Status: SYNCED")
     
-    if "/api/v1/peers" in results and results["/api/v1/peers"]["status"] == "ok":
-        peer_data = results["/api/v1/peers"]["data"]
-        peer_count = len(peer_data.get("peers", []))
-        print(f"👥 Connected Peers: {peer_count}")
+    if oks["/api/v1/peers"]:
+        out.append(f"👥 Connected Peers: {peer_count}")
         
         if peer_count == 0:
-            print("⚠️  WARNING: No peers connected - this may cause sync issues")
+            out.append("⚠️  WARNING: No peers connected - this may cause sync issues")
     
-    if "/api/v1/mempool" in results and results["/api/v1/mempool"]["status"] == "ok":
-        mempool_data = results["/api/v1/mempool"]["data"]
+    if oks["/api/v1/mempool"]:
+        mempool_data = data["/api/v1/mempool"]
         tx_count = mempool_data.get("transaction_count", 0)
-        print(f"📋 Mempool Transactions: {tx_count}")
+        out.append(f"📋 Mempool Transactions: {tx_count}")
         
         if tx_count > 1000:
-            print("⚠️  WARNING: Large mempool may indicate sync issues")
+            out.append("⚠️  WARNING: Large mempool may indicate sync issues")
     
     # Look for common sync problems
-    print("\n🔍 Common Sync Issues:")
-    print("=" * 25)
-    
-    health_ok = "/api/v1/health" in results and results["/api/v1/health"]["status"] == "ok"
-    status_ok = "/api/v1/status" in results and results["/api/v1/status"]["status"] == "ok"  
-    blockchain_ok = "/api/v1/blockchain" in results and results["/api/v1/blockchain"]["status"] == "ok"
+    out.append("\n🔍 Common Sync Issues:")
+    out.append("=" * 25)
     
     if not health_ok:
-        print("❌ Node health check failed - node may be stuck")
+        out.append("❌ Node health check failed - node may be stuck")
     if not status_ok:
-        print("❌ Node status unavailable - core services down") 
+        out.append("❌ Node status unavailable - core services down")
     if not blockchain_ok:
-        print("❌ Blockchain state unavailable - sync engine may be crashed")
-        
-    peer_count = 0
-    if "/api/v1/peers" in results and results["/api/v1/peers"]["status"] == "ok":
-        peer_data = results["/api/v1/peers"]["data"]
-        peer_count = len(peer_data.get("peers", []))
+        out.append("❌ Blockchain state unavailable - sync engine may be crashed")
     
     if peer_count == 0:
-        print("❌ No peer connections - isolated from network")
+        out.append("❌ No peer connections - isolated from network")
     elif peer_count < 3:
-        print("⚠️  Few peer connections - may have network issues")
+        out.append("⚠️  Few peer connections - may have network issues")
     else:
-        print("✅ Good peer connectivity")
+        out.append("✅ Good peer connectivity")
         
     # Suggestions
-    print("\n💡 Suggestions:")
+    out.append("\n💡 Suggestions:")
     if not health_ok or not status_ok:
-        print("   • Try: python3 shadowy_cli.py reset-sync")
-        print("   • Check node logs for errors")
-        print("   • Consider restarting the node process")
+        out.append("   • Try: python3 shadowy_cli.py reset-sync")
+        out.append("   • Check node logs for errors")
+        out.append("   • Consider restarting the node process")
     
     if peer_count == 0:
-        print("   • Check firewall settings")  
-        print("   • Verify network connectivity")
-        print("   • Check peer discovery configuration")
+        out.append("   • Check firewall settings")
+        out.append("   • Verify network connectivity")
+        out.append("   • Check peer discovery configuration")
+    
+    print("\n".join(out))
 
 if __name__ == '__main__':
     cli()
\ No newline at end of file